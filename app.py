@@ -3,15 +3,14 @@ from dotenv import load_dotenv
 import os
 import secrets
 from twilio.twiml.messaging_response import MessagingResponse
-from apscheduler.schedulers.background import BackgroundScheduler
 import logging
 from flask import render_template_string
-import atexit
 from datetime import datetime
 
 # Import our custom agent
 from chains.agent import process_incoming_message
-from services.notification_service import send_sms, schedule_reminders, get_scheduled_reminders
+from services.notification_service import get_scheduled_reminders
+from services.scheduler import start_scheduler
 
 # Load environment variables
 load_dotenv()
@@ -27,13 +26,6 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 app.secret_key = secrets.token_hex(16)  # Required for session
 
-# Initialize scheduler for reminders
-scheduler = BackgroundScheduler()
-scheduler.start()
-
-# Register shutdown function to properly clean up scheduler
-atexit.register(lambda: scheduler.shutdown())
-
 @app.route('/sms', methods=['POST'])
 def incoming_sms():
     """Handle incoming SMS messages from Twilio webhook"""
@@ -212,14 +204,14 @@ def status():
                 <table>
                     <tr>
                         <th>Phone Number</th>
-                        <th>Message</th>
+                        <th>Reminder</th>
                         <th>Scheduled Time</th>
                     </tr>
-                    {% for reminder in reminders %}
+                    {% for reminder in reminders.values() %}
                     <tr>
                         <td>{{ reminder.phone }}</td>
-                        <td>{{ reminder.message }}</td>
-                        <td>{{ reminder.run_time }}</td>
+                        <td>{{ reminder.type }}</td>
+                        <td>{{ reminder.reminder_time }}</td>
                     </tr>
                     {% endfor %}
                 </table>
@@ -232,8 +224,8 @@ def status():
     """, reminders=reminders)
 
 if __name__ == "__main__":
-    # Schedule reminders for any upcoming appointments
-    schedule_reminders(scheduler)
+    # Start the reminder scheduler; pending reminders are restored from its job store
+    start_scheduler()
     
     # Get PORT from environment variable or use default
     port = int(os.environ.get("PORT", 5000))
@@ -15,9 +15,19 @@ from apscheduler.schedulers.background import BackgroundScheduler
 import atexit
 from flask import render_template_string
 import re
+import functools
+import threading
+from collections import OrderedDict
 
-# Dictionary to store agent memory by phone number
-CONVERSATION_MEMORY_CACHE = {}
+# Agent memory by phone number, least recently active conversation first
+CONVERSATION_MEMORY_CACHE = OrderedDict()
+_memory_cache_lock = threading.Lock()
+# One lock per conversation so messages from the same sender are handled one at a time
+_CONVERSATION_LOCKS = {}
+
+# Bounds on the memory cache: conversations kept, and messages kept per conversation
+MAX_CONVERSATIONS = 5000
+MAX_HISTORY_MESSAGES = 40
 
 logger = logging.getLogger(__name__)
 
@@ -485,19 +495,9 @@ def count_user_appointments(phone_number: str) -> str:
         logger.error(f"Error counting appointments: {e}")
         return "Unable to count appointments due to an error."
 
-def create_barber_agent(memory=None, phone_number=None):
-    """Create a LangChain agent for the barber scheduling system."""
-    # Define the tools the agent can use
-    tools = [
-        book_appointment,
-        cancel_appointment,
-        reschedule_appointment,
-        check_availability,
-        get_upcoming_appointments,
-        calculate_date,
-        count_user_appointments
-    ]
-    
+@functools.lru_cache(maxsize=None)
+def _get_llm():
+    """Create the chat model once; its API client is reused by every agent."""
     # Create a chat model - use OpenAI by default since Ollama doesn't fully support functions
     # Only try Ollama if explicitly requested via environment variable
     use_ollama = os.environ.get("USE_OLLAMA", "false").lower() == "true"
@@ -514,6 +514,28 @@ def create_barber_agent(memory=None, phone_number=None):
     else:
         # Use OpenAI by default
         llm = ChatOpenAI(temperature=0)  # Zero temperature for more consistent responses
+    return llm
+
+@functools.lru_cache(maxsize=256)
+def _build_agent(phone_number=None):
+    """Build the agent runnable and its tools for a customer.
+    
+    Cached per phone number, the only thing that changes the prompt, so a
+    conversation doesn't rebuild the prompt and agent for every message.
+    """
+    # Define the tools the agent can use
+    tools = [
+        book_appointment,
+        cancel_appointment,
+        reschedule_appointment,
+        check_availability,
+        get_upcoming_appointments,
+        calculate_date,
+        count_user_appointments
+    ]
+    
+    # Create a chat model (shared by every agent)
+    llm = _get_llm()
     
     # Create a system message that explains what the agent does
     system_message = """You are a friendly and helpful AI assistant for Stellar Cuts Barber Shop. 
@@ -608,14 +630,18 @@ Treat each response as part of an ongoing conversation, not as isolated requests
         MessagesPlaceholder(variable_name="agent_scratchpad")
     ])
     
+    # Create the agent
+    return create_openai_functions_agent(llm, tools, prompt), tools
+
+def create_barber_agent(memory=None, phone_number=None):
+    """Create a LangChain agent for the barber scheduling system."""
+    agent, tools = _build_agent(phone_number)
+    
     # Create memory for the agent if not provided
     if memory is None:
         memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
     
-    # Create the agent
-    agent = create_openai_functions_agent(llm, tools, prompt)
-    
-    # Create an agent executor
+    # Create an agent executor (cheap; it binds the agent to this conversation's memory)
     agent_executor = AgentExecutor(
         agent=agent,
         tools=tools,
@@ -629,16 +655,36 @@ Treat each response as part of an ongoing conversation, not as isolated requests
 def process_incoming_message(sender_phone: str, message_text: str) -> str:
     """Process an incoming message and return a response."""
     # Get or create memory for this conversation
-    if sender_phone not in CONVERSATION_MEMORY_CACHE:
-        logger.info(f"Creating new conversation memory for {sender_phone}")
-        CONVERSATION_MEMORY_CACHE[sender_phone] = ConversationBufferMemory(
-            memory_key="chat_history", 
-            return_messages=True
-        )
-    else:
+    with _memory_cache_lock:
+        if sender_phone not in CONVERSATION_MEMORY_CACHE:
+            logger.info(f"Creating new conversation memory for {sender_phone}")
+            memory = ConversationBufferMemory(
+                memory_key="chat_history", 
+                return_messages=True
+            )
+            CONVERSATION_MEMORY_CACHE[sender_phone] = memory
+            
+            # Drop the least recently active conversations once the cache is full
+            while len(CONVERSATION_MEMORY_CACHE) > MAX_CONVERSATIONS:
+                evicted_phone, _ = CONVERSATION_MEMORY_CACHE.popitem(last=False)
+                _CONVERSATION_LOCKS.pop(evicted_phone, None)
+            is_new = True
+        else:
+            CONVERSATION_MEMORY_CACHE.move_to_end(sender_phone)
+            memory = CONVERSATION_MEMORY_CACHE[sender_phone]
+            is_new = False
+        conversation_lock = _CONVERSATION_LOCKS.setdefault(sender_phone, threading.Lock())
+    
+    # Run one message per conversation at a time so turns don't interleave in the memory
+    with conversation_lock:
+        return _run_conversation_turn(sender_phone, message_text, memory, is_new)
+
+def _run_conversation_turn(sender_phone: str, message_text: str, memory: ConversationBufferMemory, is_new: bool) -> str:
+    """Run the agent on one message; call with the conversation's lock held."""
+    
+    if not is_new:
         logger.info(f"Using existing conversation memory for {sender_phone}")
         # Log the existing conversation history for debugging
-        memory = CONVERSATION_MEMORY_CACHE[sender_phone]
         if hasattr(memory, 'chat_memory') and memory.chat_memory.messages:
             msg_count = len(memory.chat_memory.messages)
             logger.info(f"Existing memory has {msg_count} messages")
@@ -647,8 +693,6 @@ def process_incoming_message(sender_phone: str, message_text: str) -> str:
                 last_msgs = memory.chat_memory.messages[-min(4, msg_count):]
                 logger.info(f"Last messages in history: {[msg.content for msg in last_msgs]}")
     
-    memory = CONVERSATION_MEMORY_CACHE[sender_phone]
-    
     # Handle short responses like "yes", "no" with special context preservation
     if message_text.lower() in ["yes", "yeah", "sure", "ok", "okay", "correct"]:
         logger.info("Detected affirmative response, maintaining booking context")
@@ -659,15 +703,17 @@ def process_incoming_message(sender_phone: str, message_text: str) -> str:
     # Use the LangSmith tracing to visualize the agent's thinking
     os.environ["LANGSMITH_TRACING"] = "true"
     
-    # Get existing appointments for this user
-    try:
-        # Check for existing appointments to include in context
-        from services.appointment_service import get_upcoming_appointments as get_upcoming_appts_raw
-        upcoming_appts = get_upcoming_appts_raw(sender_phone)
-        if upcoming_appts and "No upcoming appointments" not in upcoming_appts:
-            logger.info(f"User has existing appointments: {upcoming_appts}")
-    except Exception as e:
-        logger.warning(f"Error checking for existing appointments: {e}")
+    # Get existing appointments for this user when a conversation starts; later
+    # messages reuse the cached conversation and the agent's own tool calls
+    if is_new:
+        try:
+            # Check for existing appointments to include in context
+            from services.appointment_service import get_upcoming_appointments as get_upcoming_appts_raw
+            upcoming_appts = get_upcoming_appts_raw(sender_phone)
+            if upcoming_appts and "No upcoming appointments" not in upcoming_appts:
+                logger.info(f"User has existing appointments: {upcoming_appts}")
+        except Exception as e:
+            logger.warning(f"Error checking for existing appointments: {e}")
     
     # Prepare input - make sure we only pass a single input parameter
     agent_input = {"input": message_text}
@@ -679,11 +725,14 @@ def process_incoming_message(sender_phone: str, message_text: str) -> str:
         
         # Confirm memory was updated after processing
         if hasattr(memory, 'chat_memory') and memory.chat_memory.messages:
-            msg_count = len(memory.chat_memory.messages)
+            messages = memory.chat_memory.messages
+            
+            # Keep only the most recent messages so the history doesn't grow forever
+            if len(messages) > MAX_HISTORY_MESSAGES:
+                del messages[:-MAX_HISTORY_MESSAGES]
+            
+            msg_count = len(messages)
             logger.info(f"After processing: memory has {msg_count} messages")
-            # Ensure the updated memory is saved in the cache
-            CONVERSATION_MEMORY_CACHE[sender_phone] = memory
-            logger.info(f"Updated memory in cache for {sender_phone}")
             
         # Return the agent's response
         return response["output"]
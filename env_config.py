@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Environment settings for the setup scripts.
+The .env file is parsed on import and shared through ENV; setup.py
+reloads this module before each step so edits to .env are picked up.
+"""
+
+import os
+from types import MappingProxyType
+from dotenv import dotenv_values
+
+# Values from .env, with variables already set in the environment taking
+# precedence (the same rule load_dotenv() uses)
+ENV = MappingProxyType({
+    **{key: value for key, value in dotenv_values(".env").items() if value is not None},
+    **os.environ
+})
@@ -12,6 +12,7 @@ import sys
 import logging
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
+from google_client import SCOPES, APPOINTMENT_HEADERS, get_client, get_sheet
 from dotenv import load_dotenv
 
 # Configure logging
@@ -28,7 +29,6 @@ logger = logging.getLogger("google_sheet_repair")
 load_dotenv()
 
 # Constants for Google Sheets setup
-SCOPES = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
 CREDS_FILE = os.environ.get('GOOGLE_SHEETS_CREDENTIALS_FILE', 'credentials.json')
 SHEET_ID = os.environ.get('GOOGLE_SHEET_ID')
 
@@ -73,9 +73,8 @@ def check_sheet_access():
     """Check if we can access the Google Sheet"""
     print("\n🔑 Checking Google Sheet access...")
     try:
-        creds = ServiceAccountCredentials.from_json_keyfile_name(CREDS_FILE, SCOPES)
-        client = gspread.authorize(creds)
-        sheet = client.open_by_key(SHEET_ID)
+        client = get_client(CREDS_FILE)
+        sheet = get_sheet(CREDS_FILE, SHEET_ID)
         
         # Check if sheets exists
         worksheets = sheet.worksheets()
@@ -104,7 +103,7 @@ def check_appointments_worksheet(sheet, worksheets):
         return None
     
     # Check headers
-    expected_headers = ['id', 'phone', 'datetime', 'service_type', 'created_at']
+    expected_headers = list(APPOINTMENT_HEADERS)
     try:
         actual_headers = appointments_ws.row_values(1)
         print(f"   - Headers: {actual_headers}")
@@ -127,7 +126,7 @@ def fix_worksheet(sheet, appointments_ws):
         # Worksheet exists but might have wrong headers
         try:
             appointments_ws.clear()
-            appointments_ws.append_row(['id', 'phone', 'datetime', 'service_type', 'created_at'])
+            appointments_ws.append_row(list(APPOINTMENT_HEADERS))
             print("✅ Reset 'Appointments' worksheet with correct headers")
         except Exception as e:
             print(f"❌ Error resetting worksheet: {e}")
@@ -135,7 +134,7 @@ def fix_worksheet(sheet, appointments_ws):
         # Need to create the worksheet
         try:
             appointments_ws = sheet.add_worksheet(title="Appointments", rows=1000, cols=20)
-            appointments_ws.append_row(['id', 'phone', 'datetime', 'service_type', 'created_at'])
+            appointments_ws.append_row(list(APPOINTMENT_HEADERS))
             print("✅ Created new 'Appointments' worksheet with correct headers")
         except Exception as e:
             print(f"❌ Error creating worksheet: {e}")
@@ -154,7 +153,7 @@ def test_write_appointment(appointments_ws):
         test_service = "haircut-test"
         test_created = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
-        appointments_ws.append_row([test_id, test_phone, test_datetime_str, test_service, test_created])
+        appointments_ws.append_row([test_id, test_phone, test_datetime_str, test_service, 'self', '', test_created])
         print("✅ Successfully wrote test appointment to sheet")
         
         # Try to read it back
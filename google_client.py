@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Shared Google Sheets client for the setup and repair scripts.
+Authorizes once per credentials file and opens each spreadsheet once.
+"""
+
+import functools
+import gspread
+from oauth2client.service_account import ServiceAccountCredentials
+
+SCOPES = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+
+# Column layout of the Appointments worksheet, shared with services.appointment_service
+APPOINTMENT_HEADERS = ('id', 'phone', 'datetime', 'service_type', 'recipient', 'customer_name', 'created_at')
+
+def write_appointment_headers(worksheet: gspread.Worksheet) -> None:
+    """Write APPOINTMENT_HEADERS to A1:G1 as raw values (no formula parsing)."""
+    worksheet.update(range_name='A1:G1', values=[list(APPOINTMENT_HEADERS)], value_input_option='RAW')
+
+@functools.lru_cache(maxsize=None)
+def get_client(creds_file: str) -> gspread.Client:
+    """Get a gspread client authorized with the given service account key file."""
+    creds = ServiceAccountCredentials.from_json_keyfile_name(creds_file, SCOPES)
+    return gspread.authorize(creds)
+
+@functools.lru_cache(maxsize=None)
+def get_sheet(creds_file: str, sheet_id: str) -> gspread.Spreadsheet:
+    """Get the spreadsheet with the given ID, opened with get_client()."""
+    return get_client(creds_file).open_by_key(sheet_id)
@@ -43,6 +43,10 @@ def main():
     try:
         # Import the bot module here to allow environment setup first
         from telegram_bot import run_bot
+        from services.scheduler import start_scheduler
+        
+        # Save booked reminders to the shared job store; the web process sends them
+        start_scheduler(paused=True)
         
         # Run the bot with polling
         run_bot()
@@ -5,15 +5,22 @@ from datetime import datetime, timedelta, time
 import logging
 import json
 import re
-from dateutil.parser import parse as dateutil_parse
 from typing import Dict, List, Any, Optional, Tuple, Union
 from dotenv import load_dotenv
 import time as sleep_time
 import random
 import threading
 import platform
-import time
 import calendar
+import atexit
+import functools
+import concurrent.futures
+import heapq
+import itertools
+from collections import deque, defaultdict, namedtuple
+
+# Column layout of the Appointments worksheet, shared with the setup scripts
+from google_client import APPOINTMENT_HEADERS
 
 # Import notification services
 from services.notification_service import (
@@ -39,6 +46,16 @@ SCOPES = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/a
 CREDS_FILE = os.environ.get('GOOGLE_SHEETS_CREDENTIALS_FILE', 'credentials.json')
 SHEET_ID = os.environ.get('GOOGLE_SHEET_ID')
 
+# Barber contact details for notifications
+BARBER_PHONE = os.environ.get('BARBER_PHONE_NUMBER', '+12345678901')
+BARBER_TELEGRAM = os.environ.get('BARBER_TELEGRAM_ID')
+
+def _refresh_env():
+    """Re-read the barber contact settings, e.g. after tests change the environment."""
+    global BARBER_PHONE, BARBER_TELEGRAM
+    BARBER_PHONE = os.environ.get('BARBER_PHONE_NUMBER', '+12345678901')
+    BARBER_TELEGRAM = os.environ.get('BARBER_TELEGRAM_ID')
+
 logger.info(f"Using Google Sheet ID: {SHEET_ID}")
 logger.info(f"Credentials file path: {os.path.abspath(CREDS_FILE) if CREDS_FILE else 'Not set'}")
 
@@ -46,15 +63,171 @@ logger.info(f"Credentials file path: {os.path.abspath(CREDS_FILE) if CREDS_FILE
 OPENING_HOUR = 10  # 10 AM
 CLOSING_HOUR = 18  # 6 PM
 APPOINTMENT_DURATION = 30  # 30 minutes
-WORKING_DAYS = [0, 1, 2, 3, 4, 5]  # Monday to Saturday (0 = Monday in our setup)
+WORKING_DAYS = frozenset({0, 1, 2, 3, 4, 5})  # Monday to Saturday (0 = Monday in our setup)
+# Days from each weekday to the next working day after it
+_NEXT_WORKING = [min(d for d in range(1, 8) if (i + d) % 7 in WORKING_DAYS) for i in range(7)]
+
+# Every bookable (hour, minute) of a working day and its display label
+_SLOT_GRID = [(hour, minute) for hour in range(OPENING_HOUR, CLOSING_HOUR) for minute in (0, 30)]
+_SLOT_LABELS = [time(hour, minute).strftime("%I:%M %p") for hour, minute in _SLOT_GRID]
+
+# A day's open slot labels in order, the same labels as a set for membership
+# checks, and each slot's start in minutes since midnight
+Slots = namedtuple("Slots", ["ordered", "index", "start_minutes"])
+
+def _make_slots(grid_slots) -> Slots:
+    """Build a Slots from ((hour, minute), label) pairs in grid order."""
+    grid_slots = tuple(grid_slots)
+    labels = [label for _, label in grid_slots]
+    start_minutes = tuple(hour * 60 + minute for (hour, minute), _ in grid_slots)
+    return Slots(labels, frozenset(labels), start_minutes)
+
+NO_SLOTS = _make_slots(())
+
+# Format used for the datetime column in the sheet and mock database
+APPOINTMENT_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Appointment IDs are "APPT-<process start>-<n>", unique even for bookings in the same second
+_ID_EPOCH = int(sleep_time.time())
+_ID_COUNTER = itertools.count(1)
+
+# Customer-facing labels like "Friday, March 14 at 03:00 PM", built from cached
+# date and time halves since the same days and slot times come up constantly
+@functools.lru_cache(maxsize=1024)
+def _fmt_date(year: int, month: int, day: int) -> str:
+    """Format a date as "Friday, March 14"."""
+    return datetime(year, month, day).strftime('%A, %B %d')
+
+@functools.lru_cache(maxsize=256)
+def _fmt_time(hour: int, minute: int) -> str:
+    """Format a time as "03:00 PM" (same as '%I:%M %p', without the locale lookup)."""
+    return f"{hour % 12 or 12:02d}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+def format_appointment_time(dt) -> str:
+    """Format an appointment datetime as "Friday, March 14 at 03:00 PM"."""
+    return f"{_fmt_date(dt.year, dt.month, dt.day)} at {_fmt_time(dt.hour, dt.minute)}"
+
+# Patterns used on the parsing hot paths
+_TIME_RE = re.compile(r'(\d+)(?::(\d+))?\s*(am|pm)?', re.IGNORECASE)  # "3pm", "3:30pm", "15:00"
+_ISO_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})$')  # "YYYY-MM-DD"
+_ISO_DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')  # "2025-3-14" anywhere in the text
+_DATE_RE = re.compile(r'(\d{1,2})[/-](\d{1,2})(?:[/-](\d{2,4}))?')  # "3/14", "03-14-2025"
+_WORD_RE = re.compile(r"[a-z]+")  # words of a lowercased string
+_UPDATED_ROW_RE = re.compile(r"!A(\d+):")  # first row of an append's updatedRange, "Appointments!A12:G15"
+
+# Weekday names and their three-letter abbreviations -> weekday number (0 = Monday)
+_WEEKDAY_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+_WEEKDAY_INDEX = {name: i for i, name in enumerate(_WEEKDAY_NAMES)}
+_WEEKDAY_INDEX.update({name[:3]: i for i, name in enumerate(_WEEKDAY_NAMES)})
+_WEEKDAY_LABELS = tuple(name.capitalize() for name in _WEEKDAY_NAMES)  # "Monday", ...
+
+def _weekday_of(token: str) -> Optional[int]:
+    """Return the weekday number a word names, or None.
+    
+    Full names also match inside a longer word, so "thursdays" and "mondays" count.
+    """
+    i = _WEEKDAY_INDEX.get(token)
+    if i is None:
+        i = next((j for j, name in enumerate(_WEEKDAY_NAMES) if name in token), None)
+    return i
+
+# Available slots per day are reused for this long; any appointment change clears them
+SLOT_CACHE_TTL = 30  # seconds
+_SLOT_CACHE = {}  # "YYYY-MM-DD" -> (monotonic time, slots)
+_slot_cache_generation = 0
+
+# Queued appointment writes are flushed every interval, or sooner once the batch size is reached
+WRITE_FLUSH_INTERVAL = 1  # seconds
+WRITE_FLUSH_BATCH_SIZE = 10
+WRITE_CONFIRM_TIMEOUT = 15  # seconds a booking waits for its row to reach the sheet
+
+# Customers sheet contents and sheet rows by phone number, reloaded once this old
+CUSTOMER_CACHE_TTL = 300  # seconds
+_CUSTOMER_CACHE = {"data": {}, "rows": {}, "ts": 0.0}
+_customer_cache_lock = threading.Lock()
+_customers_worksheet = None  # looked up once per connection
+
+def dateutil_parse(*args, **kwargs) -> datetime:
+    """Call dateutil.parser.parse, importing it on first use since the import is slow."""
+    from dateutil.parser import parse
+    return parse(*args, **kwargs)
+
+def parse_appointment_datetime(value: Any) -> datetime:
+    """Parse a stored appointment datetime, trying the known format before dateutil."""
+    try:
+        return datetime.strptime(str(value), APPOINTMENT_DATETIME_FORMAT)
+    except ValueError:
+        return dateutil_parse(str(value))
+
+def _appointment_dt(appt: Dict[str, Any]) -> datetime:
+    """Return the pre-parsed datetime of an appointment, parsing it if needed."""
+    dt = appt.get('_dt')
+    if dt is None:
+        dt = parse_appointment_datetime(appt['datetime'])
+    return dt
+
+def _appointment_label(appt: Dict[str, Any]) -> str:
+    """Return the display label of an appointment, caching it on the record."""
+    label = appt.get('_label_full')
+    if label is None:
+        label = appt['_label_full'] = format_appointment_time(_appointment_dt(appt))
+    return label
+
+def _appointment_date_key(appointment: Dict[str, Any]) -> str:
+    """Return the "YYYY-MM-DD" date of an appointment.
+    
+    Rows written by this service start with the ISO date, so the prefix is
+    used as-is; anything else falls back to parsing the datetime.
+    """
+    value = str(appointment['datetime'])
+    if _ISO_RE.match(value[:10]):
+        return value[:10]
+    return _appointment_dt(appointment).strftime("%Y-%m-%d")
 
 # Mock database for development - in production, use Google Sheets
 # This is a fallback in case Google Sheets integration isn't set up
 MOCK_DB = {
-    "appointments": [],
+    "appointments": {},  # appointment id -> appointment
+    "by_date": defaultdict(list),  # "YYYY-MM-DD" -> appointment ids
+    "by_phone": defaultdict(list),  # phone number -> appointment ids
     "customers": {}  # Store customer data including names
 }
 
+def _mock_add(appointment: Dict[str, Any]):
+    """Add an appointment to the mock database and its indices."""
+    appointment.pop('_label_full', None)  # Recomputed lazily from the new datetime
+    MOCK_DB["appointments"][appointment['id']] = appointment
+    MOCK_DB["by_date"][_appointment_date_key(appointment)].append(appointment['id'])
+    MOCK_DB["by_phone"][appointment['phone']].append(appointment['id'])
+
+def _mock_remove(appointment_id: str) -> Optional[Dict[str, Any]]:
+    """Remove an appointment from the mock database and its indices, returning it."""
+    appointment = MOCK_DB["appointments"].pop(appointment_id, None)
+    if appointment:
+        MOCK_DB["by_date"][_appointment_date_key(appointment)].remove(appointment_id)
+        MOCK_DB["by_phone"][appointment['phone']].remove(appointment_id)
+    return appointment
+
+def _mock_update(appointment_id: str, new_data: Dict[str, Any]) -> bool:
+    """Update a mock appointment in place, moving it between index entries if needed."""
+    appointment = MOCK_DB["appointments"].get(appointment_id)
+    if appointment is None:
+        return False
+    old_keys = (_appointment_date_key(appointment), appointment['phone'])
+    appointment.update(new_data)
+    appointment.pop('_label_full', None)  # Recomputed lazily from the new datetime
+    new_keys = (_appointment_date_key(appointment), appointment['phone'])
+    for index, old_key, new_key in zip(("by_date", "by_phone"), old_keys, new_keys):
+        if old_key != new_key:
+            MOCK_DB[index][old_key].remove(appointment_id)
+            MOCK_DB[index][new_key].append(appointment_id)
+    return True
+
+def _mock_lookup(index: str, key: str) -> List[Dict[str, Any]]:
+    """Return the mock appointments listed under a key of one of the indices."""
+    ids = MOCK_DB[index].get(key, [])
+    return [MOCK_DB["appointments"][appointment_id] for appointment_id in ids]
+
 # FORCE_MOCK_DB set to True to always use mock data 
 FORCE_MOCK_DB = False
 
@@ -62,7 +235,7 @@ FORCE_MOCK_DB = False
 real_now = datetime.now()
 FORCE_CURRENT_DATE = real_now
 logger.info(f"Setting forced current date to real system date: {FORCE_CURRENT_DATE}")
-logger.info(f"System time details: {time.ctime()}")
+logger.info(f"System time details: {sleep_time.ctime()}")
 logger.info(f"System platform: {platform.system()}, Python: {platform.python_version()}")
 logger.info(f"Current year: {real_now.year}, month: {real_now.month}, day: {real_now.day}")
 
@@ -71,76 +244,78 @@ def get_current_datetime():
     """Get the current datetime, with option to override for testing."""
     # Always use the real current time, not a forced time
     # This ensures dates are calculated correctly for appointments
-    current = datetime.now()
-    logger.debug(f"Current datetime: {current}")
-    return current
+    return datetime.now()
 
 # Add some mock sample data for testing
 def initialize_mock_data():
     """Initialize some mock data for testing"""
-    MOCK_DB["appointments"] = []
+    MOCK_DB["appointments"].clear()
+    MOCK_DB["by_date"].clear()
+    MOCK_DB["by_phone"].clear()
+    now = get_current_datetime()
+    timestamp = int(now.timestamp())
+    created_at = now.strftime("%Y-%m-%d %H:%M:%S")
     
     # Add a couple of appointments for the next few days
     for day_offset in range(1, 4):
-        next_day = get_current_datetime() + timedelta(days=day_offset)
+        next_day = now + timedelta(days=day_offset)
         # Skip Sundays
         if next_day.weekday() == 6:  # Sunday
             continue
             
         # Add an appointment at 11:00 AM
         morning_appt = {
-            'id': f'APPT-{int(get_current_datetime().timestamp())}-{day_offset}-1',
+            'id': f'APPT-{timestamp}-{day_offset}-1',
             'phone': '+19176565597',
             'datetime': next_day.replace(hour=11, minute=0, second=0).strftime("%Y-%m-%d %H:%M:%S"),
             'service_type': 'haircut',
-            'created_at': get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+            'created_at': created_at
         }
-        MOCK_DB["appointments"].append(morning_appt)
+        _mock_add(morning_appt)
         
         # Add an appointment at 2:00 PM
         afternoon_appt = {
-            'id': f'APPT-{int(get_current_datetime().timestamp())}-{day_offset}-2',
+            'id': f'APPT-{timestamp}-{day_offset}-2',
             'phone': '+19176565597',
             'datetime': next_day.replace(hour=14, minute=0, second=0).strftime("%Y-%m-%d %H:%M:%S"),
             'service_type': 'haircut',
-            'created_at': get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+            'created_at': created_at
         }
-        MOCK_DB["appointments"].append(afternoon_appt)
+        _mock_add(afternoon_appt)
 
-# Initialize mock data
-initialize_mock_data()
+# Initialize mock data only when the mock database is meant to be used
+if FORCE_MOCK_DB or os.environ.get('INIT_MOCK_DATA'):
+    initialize_mock_data()
 
 # Rate limiter class for Google Sheets API
 class RateLimiter:
+    """Sliding-window limiter that paces calls once the per-minute budget is used.
+    
+    Instead of recording every call, it keeps a single count that drains at
+    max_calls per minute, so each check is O(1) and the lock is only held
+    for the arithmetic.
+    """
     def __init__(self, max_calls_per_minute=60):
         self.max_calls = max_calls_per_minute
-        self.calls = []
+        self.count = 0.0  # calls in the current window, drained continuously
+        self.updated = sleep_time.monotonic()
         self.lock = threading.Lock()
     
     def wait_if_needed(self):
         """Wait if we've exceeded the rate limit"""
         with self.lock:
-            now = get_current_datetime()
-            # Remove calls older than 1 minute
-            self.calls = [t for t in self.calls if now - t < timedelta(minutes=1)]
-            
-            # If we've hit the limit, wait
-            if len(self.calls) >= self.max_calls:
-                oldest_call = self.calls[0]
-                sleep_seconds = 60 - (now - oldest_call).total_seconds()
-                sleep_seconds = max(0, sleep_seconds) + random.random()  # Add jitter
-                
-                if sleep_seconds > 0:
-                    logger.warning(f"Rate limit reached. Waiting {sleep_seconds:.2f} seconds.")
-                    # Release the lock while sleeping
-                    self.lock.release()
-                    try:
-                        sleep_time.sleep(sleep_seconds)
-                    finally:
-                        self.lock.acquire()
-            
-            # Add this call to the list
-            self.calls.append(now)
+            now = sleep_time.monotonic()
+            # Drain the calls that have aged out since the last check
+            refill = (now - self.updated) * self.max_calls / 60
+            self.count = max(0.0, self.count - refill) + 1
+            self.updated = now
+            excess = self.count - self.max_calls
+        
+        # Over budget: wait until this call's share of the window frees up
+        if excess > 0:
+            sleep_seconds = excess * 60 / self.max_calls
+            logger.warning(f"Rate limit reached. Waiting {sleep_seconds:.2f} seconds.")
+            sleep_time.sleep(sleep_seconds)
 
 # Create a global rate limiter
 sheets_rate_limiter = RateLimiter(max_calls_per_minute=50)  # Conservative limit
@@ -152,94 +327,448 @@ def rate_limited(func):
         return func(*args, **kwargs)
     return wrapper
 
-def get_sheet_client():
-    """Get Google Sheets client or None if credentials not available."""
-    if FORCE_MOCK_DB:
-        logger.info("FORCE_MOCK_DB is enabled, using mock database")
-        return None
-        
-    tries = 0
-    max_tries = 5
+# In-process cache of the Appointments worksheet
+class AppointmentCache:
+    """Read-through cache of appointment records with a short TTL.
+    
+    Reads are served from memory and indexed by date and phone number, so a
+    single get_all_records() call covers every lookup until the TTL expires.
+    Each record's datetime is parsed once on load and stored under '_dt'.
+    Writes are applied to the indices in place; appointments still waiting in
+    the write queue are merged in on every refresh. The sheet row of each
+    written appointment is tracked so updates and deletes skip the full scan.
+    """
+    def __init__(self, ttl=30):
+        self.ttl = ttl
+        self.all = []
+        self.by_date = {}
+        self.by_phone = {}
+        self.rows = {}  # appointment id -> sheet row number
+        self.fetched_at = 0.0
+        self.lock = threading.RLock()
+    
+    def get_all(self, sheet) -> List[Dict[str, Any]]:
+        """Return all records, refreshing from the sheet if the cache is stale."""
+        with self.lock:
+            if sleep_time.time() - self.fetched_at > self.ttl:
+                # Hold the flush lock so queued writes are either on the sheet or still queued
+                with _write_flush_lock:
+                    records = sheet.get_all_records()
+                    # A flush in progress may already have written some queued rows
+                    written = {record['id'] for record in records}
+                    pending = [appt for appt in _WRITE_QUEUE if appt['id'] not in written]
+                self._load(records, pending)
+            return self.all
+    
+    def get_for_date(self, sheet, target_date: str) -> List[Dict[str, Any]]:
+        """Return the records booked on the given "YYYY-MM-DD" date."""
+        with self.lock:
+            self.get_all(sheet)
+            return list(self.by_date.get(target_date, []))
+    
+    def get_for_dates(self, sheet, target_dates: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Return the records booked on each of the given "YYYY-MM-DD" dates."""
+        with self.lock:
+            self.get_all(sheet)
+            return {target_date: list(self.by_date.get(target_date, [])) for target_date in target_dates}
+    
+    def get_for_phone(self, sheet, phone_number: str) -> List[Dict[str, Any]]:
+        """Return the records booked by the given phone number."""
+        with self.lock:
+            self.get_all(sheet)
+            return list(self.by_phone.get(phone_number, []))
+    
+    def get_with_row(self, sheet, appointment_id: str) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+        """Return the sheet row and record of a written appointment."""
+        with self.lock:
+            self.get_all(sheet)
+            row = self.rows.get(appointment_id)
+            if row is None:
+                # Might have been added outside this process, reload once
+                self.invalidate()
+                self.get_all(sheet)
+                row = self.rows.get(appointment_id)
+            record = next((r for r in self.all if r['id'] == appointment_id), None)
+            return row, record
+    
+    def set_rows(self, appointment_ids: List[str], first_row: int):
+        """Record the rows of appointments that were just appended."""
+        with self.lock:
+            for row, appointment_id in enumerate(appointment_ids, first_row):
+                self.rows[appointment_id] = row
     
-    while tries < max_tries:
+    def _load(self, records: List[Dict[str, Any]], pending: List[Dict[str, Any]] = ()):
+        """Replace the cached records and rebuild the indices."""
+        self.all = []
+        self.by_date = {}
+        self.by_phone = {}
+        self.rows = {record['id']: i for i, record in enumerate(records, 2)}  # Row 1 is headers
+        for record in list(records) + list(pending):
+            self._index(record)
+        self.fetched_at = sleep_time.time()
+        logger.info(f"Loaded {len(self.all)} appointments into cache")
+    
+    def _index(self, record: Dict[str, Any]):
+        """Add a single record to the list and both indices."""
+        record.pop('_label_full', None)  # Recomputed lazily from the new datetime
         try:
-            # If we have credentials file, use Google Sheets
-            creds_path = os.path.abspath(CREDS_FILE) if CREDS_FILE else None
-            logger.info(f"Looking for credentials file at: {creds_path}")
-            logger.info(f"Google Sheet ID: {SHEET_ID}")
-            
-            if os.path.exists(CREDS_FILE) and SHEET_ID:
-                logger.info(f"Credentials file found, attempting to connect to Google Sheets")
-                creds = ServiceAccountCredentials.from_json_keyfile_name(CREDS_FILE, SCOPES)
-                client = gspread.authorize(creds)
-                
-                # Try opening the sheet to verify connection
-                try:
-                    sheet = client.open_by_key(SHEET_ID)
-                    worksheets = sheet.worksheets()
-                    logger.info(f"Successfully connected to Google Sheet. Worksheets: {[ws.title for ws in worksheets]}")
-                    
-                    # Check if Appointments worksheet exists
-                    appointments_ws = None
-                    for ws in worksheets:
-                        if ws.title == "Appointments":
-                            appointments_ws = ws
-                            break
-                    
-                    if not appointments_ws:
-                        logger.warning(f"No 'Appointments' worksheet found. Available worksheets: {[ws.title for ws in worksheets]}")
-                        # Create the Appointments worksheet with headers
-                        logger.info("Creating 'Appointments' worksheet with headers")
-                        appointments_ws = sheet.add_worksheet(title="Appointments", rows=100, cols=20)
-                        appointments_ws.append_row(['id', 'phone', 'datetime', 'service_type', 'created_at'])
-                        logger.info("'Appointments' worksheet created successfully")
-                    else:
-                        logger.info(f"Found existing 'Appointments' worksheet with {appointments_ws.row_count} rows")
-                        # Check if the worksheet has headers
-                        try:
-                            headers = appointments_ws.row_values(1)
-                            logger.info(f"Current worksheet headers: {headers}")
-                            if not headers or len(headers) < 5:
-                                logger.warning("Worksheet headers missing or incomplete, resetting headers")
-                                appointments_ws.clear()
-                                appointments_ws.append_row(['id', 'phone', 'datetime', 'service_type', 'created_at'])
-                        except Exception as header_error:
-                            logger.error(f"Error checking worksheet headers: {header_error}")
-                    
-                    return client
-                except gspread.exceptions.APIError as api_error:
-                    if hasattr(api_error, 'response') and api_error.response.status_code == 429:
-                        # Rate limit exceeded, implement exponential backoff
-                        tries += 1
-                        wait_time = (2 ** tries) + random.random()
-                        logger.warning(f"Rate limit exceeded. Attempt {tries}/{max_tries}. Waiting {wait_time:.2f} seconds...")
-                        sleep_time.sleep(wait_time)
-                        continue
-                    else:
-                        logger.error(f"API Error accessing Google Sheet: {api_error}")
-                        return None
-                except Exception as sheet_error:
-                    logger.error(f"Error accessing Google Sheet: {sheet_error}")
-                    return None
-            else:
-                if not os.path.exists(CREDS_FILE):
-                    logger.warning(f"Credentials file not found at: {os.path.abspath(CREDS_FILE) if CREDS_FILE else 'Not set'}")
-                if not SHEET_ID:
-                    logger.warning("Google Sheet ID not found in environment variables")
-                logger.warning("Google Sheets credentials not found, using mock database")
-                return None
+            record['_dt'] = parse_appointment_datetime(record['datetime'])
         except Exception as e:
-            logger.error(f"Error connecting to Google Sheets: {e}")
+            logger.error(f"Skipping appointment {record.get('id')} with bad datetime: {e}")
+            return
+        self.all.append(record)
+        self.by_date.setdefault(_appointment_date_key(record), []).append(record)
+        self.by_phone.setdefault(record['phone'], []).append(record)
+    
+    def _unindex(self, appointment_id: str) -> Optional[Dict[str, Any]]:
+        """Remove a record from the list and both indices, returning it."""
+        record = next((r for r in self.all if r['id'] == appointment_id), None)
+        if record is None:
             return None
+        self.all = [r for r in self.all if r is not record]
+        for index, key in ((self.by_date, _appointment_date_key(record)), (self.by_phone, record['phone'])):
+            remaining = [r for r in index.get(key, []) if r is not record]
+            if remaining:
+                index[key] = remaining
+            else:
+                index.pop(key, None)
+        return record
+    
+    def add(self, record: Dict[str, Any]):
+        """Write-through: apply a newly appended record."""
+        with self.lock:
+            self._index(record)
+    
+    def remove(self, appointment_id: str):
+        """Write-through: drop a deleted record and shift the rows below it up."""
+        with self.lock:
+            self._unindex(appointment_id)
+            deleted_row = self.rows.pop(appointment_id, None)
+            if deleted_row is not None:
+                for key, row in self.rows.items():
+                    if row > deleted_row:
+                        self.rows[key] = row - 1
+    
+    def update(self, appointment_id: str, new_data: Dict[str, Any]):
+        """Write-through: apply updated fields and re-index the record."""
+        with self.lock:
+            record = self._unindex(appointment_id)
+            if record is not None:
+                record.update(new_data)
+                self._index(record)
+    
+    def invalidate(self):
+        """Force the next read to refetch from the sheet."""
+        with self.lock:
+            self.fetched_at = 0.0
+
+# Create a global appointment cache
+appointment_cache = AppointmentCache(ttl=30)
+
+# Set once the Appointments header row has been checked in this process
+_SCHEMA_VERIFIED = False
+
+# Appointments waiting to be appended to the sheet by the background flusher
+_WRITE_QUEUE = deque()
+# Appointment id -> Future resolved with True once its row is on the sheet, False if it was dropped
+_WRITE_FUTURES = {}
+_write_flush_lock = threading.RLock()
+# Serializes row-changing sheet writes (append, update, delete); taken before the cache lock
+_sheet_write_lock = threading.RLock()
+_write_queue_event = threading.Event()
+_write_flusher = None
+
+def _appointment_row(appointment: Dict[str, Any]) -> List[Any]:
+    """Build a worksheet row for an appointment."""
+    return [
+        appointment['id'],
+        appointment['phone'],
+        appointment['datetime'],
+        appointment['service_type'],
+        appointment.get('recipient', 'self'),  # Add recipient, default to self if not specified
+        appointment.get('customer_name', ''),  # Add customer name
+        appointment['created_at']
+    ]
+
+def _ensure_appointment_headers(sheet):
+    """Make sure the Appointments worksheet has the expected header row.
+    
+    The check runs once per process; writes reset _SCHEMA_VERIFIED if they fail.
+    """
+    global _SCHEMA_VERIFIED
+    if _SCHEMA_VERIFIED:
+        return
+    try:
+        headers = sheet.row_values(1)
+        logger.info(f"Current sheet headers: {headers}")
         
-        # If we get here and we're still in the loop, we need to try again
+        if not headers or len(headers) < 7:  # Need 7 columns now including customer_name
+            # Only rewrite row 1; the appointments below it are left alone
+            logger.warning("Sheet headers missing or incomplete, writing header row")
+            sheet.update(range_name='A1:G1', values=[list(APPOINTMENT_HEADERS)], value_input_option='RAW')
+            appointment_cache.invalidate()
+    except Exception as e:
+        # Never touch the sheet on a failed read; check again on the next connect or write
+        logger.error(f"Error checking headers: {e}")
+        return
+    _SCHEMA_VERIFIED = True
+
+def _enqueue_appointment_write(appointment: Dict[str, Any]) -> concurrent.futures.Future:
+    """Queue an appointment for the background flusher and serve it from the cache meanwhile.
+    
+    Returns a Future that resolves to True once the row is on the sheet.
+    """
+    global _write_flusher
+    written = concurrent.futures.Future()
+    # Cache lock first, matching the order used when the cache refreshes
+    with appointment_cache.lock, _write_flush_lock:
+        _WRITE_QUEUE.append(appointment)
+        _WRITE_FUTURES[appointment['id']] = written
+        appointment_cache.add(appointment)
+        if _write_flusher is None or not _write_flusher.is_alive():
+            _write_flusher = threading.Thread(target=_write_flusher_loop, name="sheets-write-flusher", daemon=True)
+            _write_flusher.start()
+    if len(_WRITE_QUEUE) >= WRITE_FLUSH_BATCH_SIZE:
+        _write_queue_event.set()
+    return written
+
+def _drop_queued_appointment(appointment: Dict[str, Any]):
+    """Take an unwritten appointment out of the queue and cache and fail its Future.
+    
+    Call with _sheet_write_lock, appointment_cache.lock and _write_flush_lock held.
+    """
+    _WRITE_QUEUE.remove(appointment)
+    appointment_cache.remove(appointment['id'])
+    written = _WRITE_FUTURES.pop(appointment['id'], None)
+    if written is not None:
+        written.set_result(False)
+
+def _write_flusher_loop():
+    """Flush queued appointment writes every interval or when the batch fills up."""
+    while True:
+        _write_queue_event.wait(WRITE_FLUSH_INTERVAL)
+        _write_queue_event.clear()
+        if _WRITE_QUEUE:
+            flush_write_queue()
+
+@rate_limited
+def flush_write_queue() -> bool:
+    """Append all queued appointments to the sheet in a single request.
+    
+    The append runs without the cache lock, so reads and new bookings aren't
+    held up by the request; updates and deletes wait on _sheet_write_lock.
+    If the append fails the batch is dropped, so each waiting booking reports the error.
+    """
+    global _SCHEMA_VERIFIED
+    with _sheet_write_lock:
+        with _write_flush_lock:
+            if not _WRITE_QUEUE:
+                return True
+            pending = list(_WRITE_QUEUE)
+        
+        try:
+            sheet = get_appointments_worksheet()
+            if sheet is None:
+                raise RuntimeError("Google Sheets client not available")
+            _ensure_appointment_headers(sheet)
+            result = sheet.append_rows([_appointment_row(appt) for appt in pending], value_input_option='RAW')
+        except Exception as e:
+            _SCHEMA_VERIFIED = False  # Re-check the headers before the next attempt
+            logger.error(f"Error flushing queued appointments to sheet, dropping {len(pending)}: {e}")
+            with appointment_cache.lock, _write_flush_lock:
+                for appt in pending:
+                    _drop_queued_appointment(appt)
+            return False
+        
+        # Cache lock first, matching the order used when the cache refreshes
+        with appointment_cache.lock, _write_flush_lock:
+            # Remember where the rows landed, e.g. "Appointments!A5:G7"
+            match = _UPDATED_ROW_RE.search((result or {}).get('updates', {}).get('updatedRange', ''))
+            if match:
+                appointment_cache.set_rows([appt['id'] for appt in pending], int(match.group(1)))
+            else:
+                appointment_cache.invalidate()
+            # Only drop what was written; appointments queued meanwhile stay for the next flush
+            for appt in pending:
+                _WRITE_QUEUE.popleft()
+                _WRITE_FUTURES.pop(appt['id']).set_result(True)
+        logger.info(f"Flushed {len(pending)} queued appointments to sheet: {[appt['id'] for appt in pending]}")
+        return True
+
+def _find_queued_appointment(appointment_id: str) -> Optional[Dict[str, Any]]:
+    """Return a queued appointment that hasn't been written to the sheet yet."""
+    for appt in _WRITE_QUEUE:
+        if appt['id'] == appointment_id:
+            return appt
+    return None
+
+def _locate_appointment_row(sheet, appointment_id: str) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+    """Return the sheet row and record of an appointment, checked against column A.
+    
+    Call with appointment_cache.lock held so the row can't shift before it's written.
+    """
+    row_idx, record = appointment_cache.get_with_row(sheet, appointment_id)
+    if row_idx:
+        cell = sheet.get(f'A{row_idx}')
+        if not (cell and cell[0] and str(cell[0][0]) == str(appointment_id)):
+            # The sheet changed under the cached row numbers, look it up again
+            logger.warning(f"Row {row_idx} no longer holds appointment {appointment_id}, reloading rows")
+            appointment_cache.invalidate()
+            row_idx, record = appointment_cache.get_with_row(sheet, appointment_id)
+    return row_idx, record
+
+# Write anything still queued before the process exits
+atexit.register(flush_write_queue)
+
+# Connected client and Appointments worksheet, reused across calls once set up
+_sheets_client = None
+_appointments_worksheet = None
+
+# After a failed connection, calls fail fast for this long instead of retrying
+# in the foreground; a background thread keeps trying to reconnect
+SHEETS_RETRY_AFTER = 30  # seconds
+SHEETS_UNAVAILABLE_MESSAGE = "Sorry, our booking system is temporarily unavailable. Please try again in a few minutes."
+_sheets_unavailable_until = 0.0
+_sheets_reconnect_thread = None
+_sheets_reconnect_lock = threading.Lock()
+
+def _connect_sheets():
+    """Open the sheet and cache the client and Appointments worksheet, raising on failure."""
+    global _sheets_client, _appointments_worksheet, _customers_worksheet
+    logger.info(f"Credentials file found, attempting to connect to Google Sheets")
+    creds = ServiceAccountCredentials.from_json_keyfile_name(CREDS_FILE, SCOPES)
+    client = gspread.authorize(creds)
+    
+    # Try opening the sheet to verify connection
+    sheet = client.open_by_key(SHEET_ID)
+    worksheets = sheet.worksheets()
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Successfully connected to Google Sheet. Worksheets: %s", [ws.title for ws in worksheets])
+    
+    # Check if Appointments worksheet exists
+    appointments_ws = None
+    for ws in worksheets:
+        if ws.title == "Appointments":
+            appointments_ws = ws
+            break
+    
+    if not appointments_ws:
+        logger.warning(f"No 'Appointments' worksheet found. Available worksheets: {[ws.title for ws in worksheets]}")
+        # Create the Appointments worksheet with headers
+        logger.info("Creating 'Appointments' worksheet with headers")
+        appointments_ws = sheet.add_worksheet(title="Appointments", rows=100, cols=20)
+        appointments_ws.append_row(list(APPOINTMENT_HEADERS))
+        logger.info("'Appointments' worksheet created successfully")
+    else:
+        logger.info(f"Found existing 'Appointments' worksheet with {appointments_ws.row_count} rows")
+    
+    # Check the header row once; later writes skip it
+    _ensure_appointment_headers(appointments_ws)
+    
+    _appointments_worksheet = appointments_ws
+    _customers_worksheet = None
+    _sheets_client = client
+    return client
+
+def _sheets_reconnect_loop():
+    """Keep trying to reconnect to Google Sheets with exponential backoff."""
+    tries = 0
+    while _sheets_client is None:
         tries += 1
-        wait_time = (2 ** tries) + random.random()
-        logger.warning(f"General error. Attempt {tries}/{max_tries}. Waiting {wait_time:.2f} seconds...")
+        wait_time = min(2 ** tries, 60) + random.random()
+        logger.warning(f"Reconnecting to Google Sheets in {wait_time:.2f} seconds (attempt {tries})...")
         sleep_time.sleep(wait_time)
+        try:
+            _connect_sheets()
+            logger.info("Reconnected to Google Sheets")
+        except Exception as e:
+            logger.error(f"Reconnect to Google Sheets failed: {e}")
+
+def _mark_sheets_unavailable(error: Exception):
+    """Fail fast for a while and reconnect in the background."""
+    global _sheets_unavailable_until, _sheets_reconnect_thread
+    _sheets_unavailable_until = sleep_time.monotonic() + SHEETS_RETRY_AFTER
+    logger.error(f"Error connecting to Google Sheets: {error}. Failing fast while reconnecting.")
+    with _sheets_reconnect_lock:
+        if _sheets_reconnect_thread is None or not _sheets_reconnect_thread.is_alive():
+            _sheets_reconnect_thread = threading.Thread(target=_sheets_reconnect_loop, name="sheets-reconnect", daemon=True)
+            _sheets_reconnect_thread.start()
+
+def get_sheet_client():
+    """Get Google Sheets client or None if credentials not available."""
+    if FORCE_MOCK_DB:
+        logger.info("FORCE_MOCK_DB is enabled, using mock database")
+        return None
+    
+    if _sheets_client is not None:
+        return _sheets_client
+    
+    # Fail fast while a recent connection failure is being retried in the background
+    if sleep_time.monotonic() < _sheets_unavailable_until or (
+            _sheets_reconnect_thread is not None and _sheets_reconnect_thread.is_alive()):
+        return None
+    
+    # If we have credentials file, use Google Sheets
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Looking for credentials file at: %s", os.path.abspath(CREDS_FILE) if CREDS_FILE else None)
+        logger.info("Google Sheet ID: %s", SHEET_ID)
     
-    # If we've exhausted all retries
-    logger.error("Max retries reached for Google Sheets connection. Using mock database.")
+    if not (os.path.exists(CREDS_FILE) and SHEET_ID):
+        if not os.path.exists(CREDS_FILE):
+            logger.warning(f"Credentials file not found at: {os.path.abspath(CREDS_FILE) if CREDS_FILE else 'Not set'}")
+        if not SHEET_ID:
+            logger.warning("Google Sheet ID not found in environment variables")
+        logger.warning("Google Sheets credentials not found, using mock database")
+        return None
+    
+    try:
+        return _connect_sheets()
+    except Exception as e:
+        _mark_sheets_unavailable(e)
+        return None
+
+def sheets_unavailable() -> bool:
+    """Return True while a failed Google Sheets connection is being retried.
+    
+    Callers must not fall back to the mock database then, or bookings would
+    only live in this process and could clash with rows already on the sheet.
+    """
+    return _sheets_client is None and (
+        sleep_time.monotonic() < _sheets_unavailable_until or
+        (_sheets_reconnect_thread is not None and _sheets_reconnect_thread.is_alive()))
+
+def _booking_system_down() -> bool:
+    """Return True when Google Sheets is configured but can't be reached right now."""
+    return get_sheet_client() is None and sheets_unavailable()
+
+def get_appointments_worksheet():
+    """Get the cached Appointments worksheet or None if Google Sheets isn't available."""
+    if not get_sheet_client():
+        return None
+    return _appointments_worksheet
+
+# Date formats tried with strptime before falling back to dateutil; the
+# flag is True when the format includes a year, and formats flagged False
+# get the current year
+_DATE_FORMATS = (
+    ("%Y-%m-%d", True),  # 2025-03-14
+    ("%m/%d/%Y", True),  # 03/14/2025
+    ("%B %d %Y", True),  # march 14 2025
+    ("%b %d %Y", True),  # mar 14 2025
+    ("%B %d", False),    # march 14
+    ("%b %d", False),    # mar 14
+)
+
+def _parse_fixed_date(date_str: str):
+    """Parse a date in one of the fixed formats, or return None."""
+    for fmt, has_year in _DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+        if not has_year:
+            parsed = parsed.replace(year=get_current_datetime().year)
+        return parsed.date()
     return None
 
 def parse_date_time(date_str: str, time_str: str) -> Optional[datetime]:
@@ -253,17 +782,18 @@ def parse_date_time(date_str: str, time_str: str) -> Optional[datetime]:
         if date_str == "tomorrow":
             base_date = get_current_datetime().date() + timedelta(days=1)
         else:
-            # Try to parse date_str directly
-            try:
-                parsed_date = dateutil_parse(date_str, fuzzy=True).date()
-                base_date = parsed_date
-            except:
-                logger.error(f"Error parsing date: {date_str}")
-                return None
+            # Try the common fixed formats before the much slower fuzzy parse
+            base_date = _parse_fixed_date(date_str)
+            if base_date is None:
+                try:
+                    parsed_date = dateutil_parse(date_str, fuzzy=True).date()
+                    base_date = parsed_date
+                except:
+                    logger.error(f"Error parsing date: {date_str}")
+                    return None
         
         # For time, check if it's in format like "3pm" or "3:30pm" or "15:00"
-        time_pattern = r'(\d+)(?::(\d+))?\s*(am|pm)?'
-        time_match = re.match(time_pattern, time_str, re.IGNORECASE)
+        time_match = _TIME_RE.match(time_str)
         
         if time_match:
             hour = int(time_match.group(1))
@@ -313,40 +843,43 @@ def is_valid_appointment_time(dt: datetime) -> bool:
         return False
     
     # Check if it's a valid time slot (every 30 minutes)
-    if dt.minute not in [0, 30]:
+    if dt.minute not in {0, 30}:
         return False
     
     return True
 
-def get_available_slots(date: str, service_type: str = "haircut") -> List[str]:
-    """Get available time slots for a given date."""
+def get_available_slots(date: str, service_type: str = "haircut",
+                        existing_appointments: Optional[List[Dict[str, Any]]] = None) -> Slots:
+    """Get available time slots for a given date as a Slots.
+    
+    Pass existing_appointments when they were already fetched to skip the lookup.
+    """
     try:
-        # Log the real current date/time at call time for debugging
-        real_now = datetime.now()
-        logger.info(f"Real current datetime at call time: {real_now}")
-        logger.info(f"Using current datetime from get_current_datetime(): {get_current_datetime()}")
-        logger.info(f"Getting available slots for date: '{date}' and service_type: '{service_type}'")
+        # Log the current date/time at call time for debugging
+        now = get_current_datetime()
+        logger.info("Current datetime at call time: %s", now)
+        logger.info("Getting available slots for date: '%s' and service_type: '%s'", date, service_type)
         
         # First try to handle it as a YYYY-MM-DD string
         try:
-            date_parts = date.split('-')
-            if len(date_parts) == 3:
-                year, month, day = map(int, date_parts)
+            iso_match = _ISO_RE.match(date)
+            if iso_match:
+                year, month, day = map(int, iso_match.groups())
                 target_date = datetime(year=year, month=month, day=day)
-                logger.info(f"Parsed as ISO format date: {target_date}")
+                logger.info("Parsed as ISO format date: %s", target_date)
             else:
                 # Not in ISO format, use dateutil parser
                 target_date = dateutil_parse(date, fuzzy=True)
-                logger.info(f"Parsed with dateutil: {target_date}")
+                logger.info("Parsed with dateutil: %s", target_date)
         except Exception as e:
-            logger.error(f"Error parsing date string '{date}': {e}")
+            logger.error("Error parsing date string '%s': %s", date, e)
             # Try with dateutil as a fallback
             try:
                 target_date = dateutil_parse(date, fuzzy=True)
-                logger.info(f"Fallback parse with dateutil: {target_date}")
+                logger.info("Fallback parse with dateutil: %s", target_date)
             except:
-                logger.error(f"Could not parse date '{date}' at all")
-                return []
+                logger.error("Could not parse date '%s' at all", date)
+                return NO_SLOTS
                 
         target_date = datetime(
             year=target_date.year,
@@ -354,68 +887,93 @@ def get_available_slots(date: str, service_type: str = "haircut") -> List[str]:
             day=target_date.day
         )
         
-        logger.info(f"Using target date: {target_date}")
+        logger.info("Using target date: %s", target_date)
         
         # Check if it's a working day
         if target_date.weekday() not in WORKING_DAYS:
-            logger.info(f"Date {target_date} is not a working day (weekday={target_date.weekday()})")
-            return []
+            logger.info("Date %s is not a working day (weekday=%s)", target_date, target_date.weekday())
+            return NO_SLOTS
+        
+        # Serve a recent result for the same day unless the caller brought its own appointments
+        cache_key = None
+        if existing_appointments is None:
+            cache_key = target_date.strftime("%Y-%m-%d")
+            generation = _slot_cache_generation
+            cached = _SLOT_CACHE.get(cache_key)
+            if cached and sleep_time.monotonic() - cached[0] < SLOT_CACHE_TTL:
+                logger.info("Using cached slots for %s", cache_key)
+                return cached[1]
+        
+        # Start from the fixed slot grid; only today's slots need a datetime
+        # to check they're more than 1 hour away
+        if target_date.date() > now.date():
+            all_slots = list(zip(_SLOT_GRID, _SLOT_LABELS))
+        else:
+            cutoff = now + timedelta(hours=1)
+            all_slots = [
+                (hm, label) for hm, label in zip(_SLOT_GRID, _SLOT_LABELS)
+                if target_date.replace(hour=hm[0], minute=hm[1]) > cutoff
+            ]
         
-        # Generate all possible slots
-        all_slots = []
-        for hour in range(OPENING_HOUR, CLOSING_HOUR):
-            for minute in [0, 30]:
-                slot_time = datetime(
-                    year=target_date.year,
-                    month=target_date.month,
-                    day=target_date.day,
-                    hour=hour, 
-                    minute=minute
-                )
-                # Add all future slots (more than 1 hour away)
-                # For dates beyond today, include all slots
-                if target_date.date() > get_current_datetime().date() or slot_time > get_current_datetime() + timedelta(hours=1):
-                    all_slots.append(slot_time)
-        
-        logger.info(f"Generated {len(all_slots)} possible slots for {target_date}")
+        logger.info("Generated %s possible slots for %s", len(all_slots), target_date)
         
         # Get existing appointments for that day
-        existing_appointments = get_appointments_for_date(target_date)
-        logger.info(f"Found {len(existing_appointments)} existing appointments for {target_date}")
+        if existing_appointments is None:
+            existing_appointments = get_appointments_for_date(target_date)
+        logger.info("Found %s existing appointments for %s", len(existing_appointments), target_date)
         
         # If no appointments found in the future, just return all slots
         # Added extra check for future dates
         if not existing_appointments:
             logger.info(f"No existing appointments found, all slots are available")
-            return [slot.strftime("%I:%M %p") for slot in all_slots]
+            available_slots = _make_slots(all_slots)
+            if cache_key:
+                _remember_slots(cache_key, generation, available_slots)
+            return available_slots
+        
+        # Collect the grid slots blocked by existing appointments. Slots and
+        # appointments are both 30 minutes long, so an appointment blocks the
+        # slot it starts in and, when it is off the grid, the following one.
+        slot_length = timedelta(minutes=APPOINTMENT_DURATION)
+        booked = set()
+        for appt in existing_appointments:
+            try:
+                appt_time = _appointment_dt(appt)
+            except Exception as e:
+                logger.error("Error reading appointment time: %s", e)
+                continue
+            offset = (appt_time - appt_time.replace(minute=0, second=0, microsecond=0)) % slot_length
+            slot_start = appt_time - offset
+            booked.add((slot_start.hour, slot_start.minute))
+            if offset:
+                next_slot = slot_start + slot_length
+                booked.add((next_slot.hour, next_slot.minute))
         
         # Filter out booked slots
-        available_slots = []
-        for slot in all_slots:
-            is_available = True
-            for appt in existing_appointments:
-                try:
-                    appt_time = dateutil_parse(appt['datetime'])
-                    # Check if this slot overlaps with an existing appointment
-                    if abs((slot - appt_time).total_seconds()) < (APPOINTMENT_DURATION * 60):
-                        is_available = False
-                        logger.info(f"Slot {slot} conflicts with appointment at {appt_time}")
-                        break
-                except Exception as e:
-                    logger.error(f"Error comparing appointment times: {e}")
-                    continue
-            
-            if is_available:
-                available_slots.append(slot.strftime("%I:%M %p"))
+        available_slots = _make_slots(slot for slot in all_slots if slot[0] not in booked)
         
-        logger.info(f"Found {len(available_slots)} available slots")
-        for slot in available_slots:
-            logger.debug(f"Available slot: {slot}")
+        logger.info("Found %d available slots", len(available_slots.ordered))
+        if logger.isEnabledFor(logging.DEBUG):
+            for slot in available_slots.ordered:
+                logger.debug("Available slot: %s", slot)
+        if cache_key:
+            _remember_slots(cache_key, generation, available_slots)
         return available_slots
     
     except Exception as e:
-        logger.error(f"Error getting available slots: {e}")
-        return []
+        logger.error("Error getting available slots: %s", e)
+        return NO_SLOTS
+
+def _invalidate_slot_cache():
+    """Drop cached slots after an appointment is added, moved or removed."""
+    global _slot_cache_generation
+    _slot_cache_generation += 1
+    _SLOT_CACHE.clear()
+
+def _remember_slots(cache_key: str, generation: int, available_slots: Slots):
+    """Cache a day's slots unless an appointment changed while they were computed."""
+    if generation == _slot_cache_generation:
+        _SLOT_CACHE[cache_key] = (sleep_time.monotonic(), available_slots)
 
 @rate_limited
 def get_appointments_for_date(target_date: datetime) -> List[Dict[str, Any]]:
@@ -425,24 +983,45 @@ def get_appointments_for_date(target_date: datetime) -> List[Dict[str, Any]]:
     if client:
         # Real implementation with Google Sheets
         try:
-            sheet = client.open_by_key(SHEET_ID).worksheet("Appointments")
-            all_records = sheet.get_all_records()
+            sheet = get_appointments_worksheet()
             
-            # Filter to only get appointments for the target date
-            return [
-                record for record in all_records 
-                if dateutil_parse(record['datetime']).date() == target_date.date()
-            ]
+            # Served from the cache's by-date index
+            return appointment_cache.get_for_date(sheet, target_date.strftime("%Y-%m-%d"))
         except Exception as e:
             logger.error(f"Error getting appointments from sheet: {e}")
             return []
+    elif sheets_unavailable():
+        logger.warning("Google Sheets unavailable, not reading appointments")
+        return []
     else:
         # Mock implementation
-        target_date_str = target_date.strftime("%Y-%m-%d")
-        return [
-            appt for appt in MOCK_DB["appointments"] 
-            if appt['datetime'].startswith(target_date_str)
-        ]
+        return _mock_lookup("by_date", target_date.strftime("%Y-%m-%d"))
+
+@rate_limited
+def get_appointments_for_dates(dates: List[Any]) -> Dict[Any, List[Dict[str, Any]]]:
+    """Get the appointments for several dates at once, keyed by date.
+    
+    All dates are answered from a single read of the sheet.
+    """
+    days = [d.date() if isinstance(d, datetime) else d for d in dates]
+    keys = [day.strftime("%Y-%m-%d") for day in days]
+    client = get_sheet_client()
+    
+    if client:
+        # Real implementation with Google Sheets
+        try:
+            sheet = get_appointments_worksheet()
+            by_key = appointment_cache.get_for_dates(sheet, keys)
+            return {day: by_key[key] for day, key in zip(days, keys)}
+        except Exception as e:
+            logger.error(f"Error getting appointments from sheet: {e}")
+            return {day: [] for day in days}
+    elif sheets_unavailable():
+        logger.warning("Google Sheets unavailable, not reading appointments")
+        return {day: [] for day in days}
+    else:
+        # Mock implementation
+        return {day: _mock_lookup("by_date", key) for day, key in zip(days, keys)}
 
 @rate_limited
 def get_appointments_for_phone(phone_number: str) -> List[Dict[str, Any]]:
@@ -452,144 +1031,150 @@ def get_appointments_for_phone(phone_number: str) -> List[Dict[str, Any]]:
     if client:
         # Real implementation with Google Sheets
         try:
-            sheet = client.open_by_key(SHEET_ID).worksheet("Appointments")
-            all_records = sheet.get_all_records()
+            sheet = get_appointments_worksheet()
             
-            # Filter to only get appointments for this phone number
-            return [
-                record for record in all_records 
-                if record['phone'] == phone_number
-            ]
+            # Served from the cache's by-phone index
+            return appointment_cache.get_for_phone(sheet, phone_number)
         except Exception as e:
             logger.error(f"Error getting appointments from sheet: {e}")
             return []
+    elif sheets_unavailable():
+        logger.warning("Google Sheets unavailable, not reading appointments")
+        return []
     else:
         # Mock implementation
-        return [
-            appt for appt in MOCK_DB["appointments"] 
-            if appt['phone'] == phone_number
-        ]
+        return _mock_lookup("by_phone", phone_number)
 
 @rate_limited
 def add_appointment_to_sheet(appointment: Dict[str, Any]) -> bool:
-    """Add a new appointment to the Google Sheet."""
+    """Add a new appointment to the Google Sheet.
+    
+    Rows are queued and appended in batches by a background flusher; this
+    waits until the appointment's own row has been written.
+    """
+    _invalidate_slot_cache()
     client = get_sheet_client()
     
     if client:
         try:
-            logger.info(f"Getting worksheet 'Appointments' from sheet ID: {SHEET_ID}")
-            sheet = client.open_by_key(SHEET_ID).worksheet("Appointments")
-            
-            # Verify the sheet exists and has correct headers
+            # Queue the row for a batched append and wait for that batch to be written
+            written = _enqueue_appointment_write(appointment)
             try:
-                headers = sheet.row_values(1)
-                logger.info(f"Current sheet headers: {headers}")
-                
-                if not headers or len(headers) < 7:  # Need 7 columns now including customer_name
-                    logger.warning("Sheet headers missing or incomplete, adding headers")
-                    sheet.clear()
-                    sheet.append_row(['id', 'phone', 'datetime', 'service_type', 'recipient', 'customer_name', 'created_at'])
-            except Exception as e:
-                logger.error(f"Error checking headers: {e}, attempting to add headers")
-                sheet.clear()
-                sheet.append_row(['id', 'phone', 'datetime', 'service_type', 'recipient', 'customer_name', 'created_at'])
-            
-            # Add the new appointment
-            sheet.append_row([
-                appointment['id'],
-                appointment['phone'],
-                appointment['datetime'],
-                appointment['service_type'],
-                appointment.get('recipient', 'self'),  # Add recipient, default to self if not specified
-                appointment.get('customer_name', ''),  # Add customer name
-                appointment['created_at']
-            ])
-            logger.info(f"Added appointment {appointment['id']} to sheet")
-            return True
+                if written.result(timeout=WRITE_CONFIRM_TIMEOUT):
+                    logger.info(f"Added appointment {appointment['id']} to sheet")
+                    return True
+            except concurrent.futures.TimeoutError:
+                # The sheet write lock waits out an append that is already in flight
+                with _sheet_write_lock, appointment_cache.lock, _write_flush_lock:
+                    queued = _find_queued_appointment(appointment['id'])
+                    if queued:
+                        _drop_queued_appointment(queued)
+                # The row may have been written just before it could be dropped
+                if written.done() and written.result():
+                    return True
+                logger.error(f"Timed out writing appointment {appointment['id']} to sheet")
+            return False
         except Exception as e:
             logger.error(f"Error adding appointment to sheet: {e}")
             return False
+    elif sheets_unavailable():
+        logger.error(f"Google Sheets unavailable, not booking appointment {appointment['id']}")
+        return False
     else:
         # Mock implementation
         logger.info(f"Using mock database for booking - client was not available")
-        MOCK_DB["appointments"].append(appointment)
+        _mock_add(appointment)
         return True
 
 @rate_limited
 def remove_appointment_from_sheet(appointment_id: str) -> bool:
     """Remove an appointment from Google Sheets."""
+    _invalidate_slot_cache()
     client = get_sheet_client()
     
     if client:
         try:
-            sheet = client.open_by_key(SHEET_ID).worksheet("Appointments")
-            all_records = sheet.get_all_records()
-            
-            # Find the row index for this appointment
-            row_idx = None
-            for i, record in enumerate(all_records, 2):  # Start at 2 because row 1 is headers
-                if record['id'] == appointment_id:
-                    row_idx = i
-                    break
-            
-            if row_idx:
-                sheet.delete_row(row_idx)
-                logger.info(f"Removed appointment {appointment_id} from sheet")
-                return True
-            else:
-                logger.warning(f"Appointment {appointment_id} not found in sheet")
-                return False
+            # Hold the cache lock from lookup to row shift so no other write moves the row
+            # Sheet write lock, then cache lock, matching the order used by the flusher
+            with _sheet_write_lock, appointment_cache.lock, _write_flush_lock:
+                # Appointments still waiting in the write queue never reach the sheet
+                queued = _find_queued_appointment(appointment_id)
+                if queued:
+                    _drop_queued_appointment(queued)
+                    logger.info(f"Removed queued appointment {appointment_id} before it was written")
+                    return True
+                
+                sheet = get_appointments_worksheet()
+                row_idx, _ = _locate_appointment_row(sheet, appointment_id)
+                
+                if row_idx:
+                    sheet.delete_rows(row_idx, row_idx)
+                    appointment_cache.remove(appointment_id)
+                    logger.info(f"Removed appointment {appointment_id} from sheet")
+                    return True
+                else:
+                    logger.warning(f"Appointment {appointment_id} not found in sheet")
+                    return False
         except Exception as e:
             logger.error(f"Error removing appointment from sheet: {e}")
             return False
+    elif sheets_unavailable():
+        logger.error(f"Google Sheets unavailable, not removing appointment {appointment_id}")
+        return False
     else:
         # Mock implementation
-        for i, appt in enumerate(MOCK_DB["appointments"]):
-            if appt['id'] == appointment_id:
-                MOCK_DB["appointments"].pop(i)
-                return True
-        return False
+        return _mock_remove(appointment_id) is not None
 
 @rate_limited
 def update_appointment_in_sheet(appointment_id: str, new_data: Dict[str, Any]) -> bool:
     """Update an existing appointment in Google Sheets."""
+    _invalidate_slot_cache()
     client = get_sheet_client()
     
     if client:
         try:
-            sheet = client.open_by_key(SHEET_ID).worksheet("Appointments")
-            all_records = sheet.get_all_records()
-            
-            # Find the row index for this appointment
-            row_idx = None
-            for i, record in enumerate(all_records, 2):  # Start at 2 because row 1 is headers
-                if record['id'] == appointment_id:
-                    row_idx = i
-                    break
+            # Only phone, datetime and service_type (columns B-D) can be changed
+            changes = {
+                key: value for key, value in new_data.items()
+                if key in {"phone", "datetime", "service_type"}
+            }
             
-            if row_idx:
-                # Update the specific cells that have changed
-                for key, value in new_data.items():
-                    if key in ["phone", "datetime", "service_type"]:
-                        col_idx = ["id", "phone", "datetime", "service_type", "created_at"].index(key) + 1
-                        sheet.update_cell(row_idx, col_idx, value)
+            # Hold the cache lock from lookup to write so no other write moves the row
+            with _sheet_write_lock, appointment_cache.lock, _write_flush_lock:
+                # Appointments still waiting in the write queue are updated in place
+                queued = _find_queued_appointment(appointment_id)
+                if queued:
+                    appointment_cache.update(appointment_id, changes)
+                    queued.update(changes)
+                    logger.info(f"Updated queued appointment {appointment_id} before it was written")
+                    return True
                 
-                logger.info(f"Updated appointment {appointment_id} in sheet")
-                return True
-            else:
-                logger.warning(f"Appointment {appointment_id} not found in sheet")
-                return False
+                sheet = get_appointments_worksheet()
+                row_idx, record = _locate_appointment_row(sheet, appointment_id)
+                
+                if row_idx and record:
+                    # Write the changed cells in a single request
+                    merged = dict(record, **changes)
+                    sheet.batch_update([{
+                        'range': f'B{row_idx}:D{row_idx}',
+                        'values': [[merged['phone'], merged['datetime'], merged['service_type']]]
+                    }])
+                    appointment_cache.update(appointment_id, changes)
+                    
+                    logger.info(f"Updated appointment {appointment_id} in sheet")
+                    return True
+                else:
+                    logger.warning(f"Appointment {appointment_id} not found in sheet")
+                    return False
         except Exception as e:
             logger.error(f"Error updating appointment in sheet: {e}")
             return False
+    elif sheets_unavailable():
+        logger.error(f"Google Sheets unavailable, not updating appointment {appointment_id}")
+        return False
     else:
         # Mock implementation
-        for i, appt in enumerate(MOCK_DB["appointments"]):
-            if appt['id'] == appointment_id:
-                for key, value in new_data.items():
-                    MOCK_DB["appointments"][i][key] = value
-                return True
-        return False
+        return _mock_update(appointment_id, new_data)
 
 @rate_limited
 def find_appointment(phone: str, appointment_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
@@ -607,17 +1192,41 @@ def find_appointment(phone: str, appointment_id: Optional[str] = None) -> Option
         return None
     else:
         # Find the next upcoming appointment
-        upcoming = [appt for appt in appointments if dateutil_parse(appt['datetime']) > get_current_datetime()]
+        now = get_current_datetime()
+        upcoming = [appt for appt in appointments if _appointment_dt(appt) > now]
         if not upcoming:
             return None
             
         # Sort by date and return the earliest
-        upcoming.sort(key=lambda x: dateutil_parse(x['datetime']))
+        upcoming.sort(key=_appointment_dt)
         return upcoming[0]
 
+# Worker threads for the reminder and notification calls that follow a booking change
+_IO_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="booking-io")
+IO_WAIT_TIMEOUT = 15  # seconds
+
+def _log_io_error(future):
+    """Log the exception of a finished background call, if any."""
+    error = future.exception()
+    if error:
+        logger.error(f"Background notification task failed: {error}")
+
+def _run_io(calls: List[Tuple], wait: bool = True):
+    """Run independent (func, *args) calls in parallel on the I/O pool.
+    
+    Waits up to IO_WAIT_TIMEOUT for them to finish unless wait is False.
+    Failures are logged and never fail the booking itself.
+    """
+    futures = [_IO_POOL.submit(func, *args) for func, *args in calls]
+    for future in futures:
+        future.add_done_callback(_log_io_error)
+    if wait:
+        concurrent.futures.wait(futures, timeout=IO_WAIT_TIMEOUT)
+
 def book_appointment(phone_number: str, entities: Dict) -> Dict:
     """Book a new appointment based on extracted entities."""
-    logger.info(f"Booking appointment for {phone_number} with entities {entities}")
+    logger.info("Booking appointment for %s with entities %s", phone_number, entities)
+    now = get_current_datetime()
     
     try:
         # Extract entities
@@ -627,35 +1236,14 @@ def book_appointment(phone_number: str, entities: Dict) -> Dict:
         recipient = entities.get('recipient', 'self')  # Get recipient, default to 'self'
         customer_name = entities.get('customer_name', '')  # Get customer name if provided
         
-        # If we have a customer name, store it in the customers database
-        if customer_name:
-            logger.info(f"Saving customer name: {customer_name} for {phone_number}")
-            save_customer_info(phone_number, {"name": customer_name})
-        else:
-            # Try to get the customer's name from the database
-            customer_info = get_customer_info(phone_number)
-            if customer_info and customer_info.get('name'):
-                customer_name = customer_info.get('name')
-                logger.info(f"Retrieved customer name from database: {customer_name}")
-        
-        # Parse the date/time - check if it's already a formatted datetime string
-        appointment_dt = None
-        
-        # First try to parse as an ISO formatted date string (YYYY-MM-DD HH:MM:SS)
+        # Parse the date/time - "YYYY-MM-DD HH:MM:SS" as the fast path, then natural language
         try:
-            if isinstance(date_time, str) and " " in date_time and ":" in date_time:
-                logger.info(f"Attempting to parse as ISO formatted string: {date_time}")
-                appointment_dt = datetime.strptime(date_time, "%Y-%m-%d %H:%M:%S")
-                logger.info(f"Successfully parsed as ISO format: {appointment_dt}")
-            else:
-                # Fall back to the natural language parser
-                logger.info(f"Not an ISO format, using natural language parser")
-                appointment_dt = parse_datetime(date_time)
-        except Exception as parse_error:
-            logger.error(f"Error parsing date string: {parse_error}")
+            appointment_dt = datetime.strptime(date_time, APPOINTMENT_DATETIME_FORMAT)
+        except (TypeError, ValueError):
+            logger.info(f"Not an ISO format, using natural language parser")
             appointment_dt = parse_datetime(date_time)
             
-        logger.info(f"Parsed date/time: '{date_time}' -> {appointment_dt}")
+        logger.info("Parsed date/time: '%s' -> %s", date_time, appointment_dt)
         
         if not appointment_dt:
             return {
@@ -671,19 +1259,19 @@ def book_appointment(phone_number: str, entities: Dict) -> Dict:
             }
             
         # Check if it's in the past
-        if appointment_dt < get_current_datetime():
-            logger.info(f"Requested time is in the past: {appointment_dt}. Current time: {get_current_datetime()}")
+        if appointment_dt < now:
+            logger.info("Requested time is in the past: %s. Current time: %s", appointment_dt, now)
             return {
                 'success': False,
                 'message': "I can't book appointments in the past. Please choose a future date and time. How about tomorrow or later this week?"
             }
             
         # Format the date/time for a confirmation message if not confirmed yet
-        formatted_time = appointment_dt.strftime('%A, %B %d at %I:%M %p')
+        formatted_time = format_appointment_time(appointment_dt)
         
         # Only check existing appointments for conflicts if booking for self
         skip_conflict_check = recipient.lower() != 'self'
-        logger.info(f"Recipient is '{recipient}', skip_conflict_check = {skip_conflict_check}")
+        logger.info("Recipient is '%s', skip_conflict_check = %s", recipient, skip_conflict_check)
         
         if not is_confirmed:
             recipient_msg = "" if recipient.lower() == 'self' else f" for {recipient}"
@@ -692,47 +1280,41 @@ def book_appointment(phone_number: str, entities: Dict) -> Dict:
                 'message': f"I'll book your {service_type} appointment{recipient_msg} for {formatted_time}. Is that correct? Please confirm to proceed with booking."
             }
         
+        # Only a confirmed booking needs the sheet, so check for an outage here
+        if _booking_system_down():
+            return {'success': False, 'message': SHEETS_UNAVAILABLE_MESSAGE}
+        
         # Skip available slot check if booking for someone else
+        available_slots = None
         if skip_conflict_check:
-            logger.info(f"Skipping conflict check because booking for {recipient}")
+            logger.info("Skipping conflict check because booking for %s", recipient)
+        else:
+            # Fetch the day's slots once for the check and the alternatives below
+            available_slots = get_available_slots(appointment_dt.strftime("%Y-%m-%d"))
+        
         # Otherwise check if the slot is available
-        elif not is_slot_available(appointment_dt):
+        if available_slots is not None and not is_slot_available(appointment_dt, available_slots):
             # Find nearby available slots
-            day_str = appointment_dt.strftime("%Y-%m-%d")
-            available_slots = get_available_slots(day_str)
-            
-            if available_slots:
+            if available_slots.ordered:
                 # Find closest available slots
                 requested_minutes = appointment_dt.hour * 60 + appointment_dt.minute
-                closest_slots = []
-                
-                for slot in available_slots[:3]:  # Get up to 3 alternatives
-                    hour, minute = map(int, re.search(r"(\d+):(\d+)", slot).groups())
-                    if "PM" in slot and hour != 12:
-                        hour += 12
-                    slot_minutes = hour * 60 + minute
-                    closest_slots.append((abs(slot_minutes - requested_minutes), slot))
-                
-                closest_slots.sort()  # Sort by time difference
-                alternative_times = ", ".join([slot for _, slot in closest_slots[:2]])
+                closest_slots = nearest_slots(available_slots, requested_minutes, 2, pool=3)  # Get up to 3 alternatives
+                alternative_times = ", ".join(closest_slots)
                 
                 return {
                     'success': False,
                     'message': f"I'm sorry, but that time slot is already booked. The closest available times on the same day are: {alternative_times}. Would you like to book one of these instead?"
                 }
             else:
-                # Check next day
-                next_day = appointment_dt.date() + timedelta(days=1)
-                # Skip to next working day if needed
-                while next_day.weekday() not in WORKING_DAYS:
-                    next_day += timedelta(days=1)
+                # Check the next working day
+                next_day = appointment_dt.date() + timedelta(days=_NEXT_WORKING[appointment_dt.weekday()])
                     
                 next_day_str = next_day.strftime("%Y-%m-%d")
                 next_day_slots = get_available_slots(next_day_str)
                 
-                if next_day_slots:
-                    formatted_date = next_day.strftime('%A, %B %d')
-                    sample_times = ", ".join(next_day_slots[:3])
+                if next_day_slots.ordered:
+                    formatted_date = _fmt_date(next_day.year, next_day.month, next_day.day)
+                    sample_times = ", ".join(next_day_slots.ordered[:3])
                     return {
                         'success': False,
                         'message': f"I'm sorry, but that time slot is already booked and we don't have any other openings on that day. We do have availability on {formatted_date}, including: {sample_times}. Would you like to book one of these instead?"
@@ -743,35 +1325,34 @@ def book_appointment(phone_number: str, entities: Dict) -> Dict:
                         'message': f"I'm sorry, but that time slot is already booked. We seem to be quite busy right now. Would you like to check availability for a different day?"
                     }
             
-        # All checks passed, book the appointment
-        appointment_id = book_appointment_slot(phone_number, appointment_dt, service_type, recipient)
-        
-        # Format the response time nicely
-        formatted_time = appointment_dt.strftime('%A, %B %d at %I:%M %p')
-        
-        # Schedule reminders (now includes both 24h and 1h reminders)
-        schedule_reminders(phone_number, appointment_dt)
+        # All checks passed and the booking is confirmed; only now touch the customers sheet.
+        # book_appointment_slot reads the name back when it writes the appointment.
+        if customer_name:
+            logger.info("Saving customer name: %s for %s", customer_name, phone_number)
+            save_customer_info(phone_number, {"name": customer_name})
         
-        # Send confirmation to the customer
-        send_booking_confirmation(phone_number, appointment_dt, service_type, appointment_id)
+        # Book the appointment
+        appointment_id = book_appointment_slot(phone_number, appointment_dt, service_type, recipient, now=now)
         
-        # Notify the barber about the new booking
-        barber_phone = os.environ.get('BARBER_PHONE_NUMBER', '+12345678901')
-        barber_telegram = os.environ.get('BARBER_TELEGRAM_ID', None)
+        logger.info("Sending notification to barber phone: %s, barber Telegram: %s", BARBER_PHONE, BARBER_TELEGRAM)
         
-        logger.info(f"Sending notification to barber phone: {barber_phone}, barber Telegram: {barber_telegram}")
-        notify_barber_of_booking(barber_phone, phone_number, appointment_dt, recipient)
+        # Schedule reminders (24h and 1h), confirm to the customer and notify the barber in parallel
+        _run_io([
+            (schedule_reminders, phone_number, appointment_dt),
+            (send_booking_confirmation, phone_number, appointment_dt, service_type, appointment_id),
+            (notify_barber_of_booking, BARBER_PHONE, phone_number, appointment_dt, recipient),
+        ])
         
         # Build a more conversational response based on the timing
         time_context = ""
-        days_until = (appointment_dt.date() - get_current_datetime().date()).days
+        days_until = (appointment_dt.date() - now.date()).days
         
         if days_until == 0:
             time_context = "today"
         elif days_until == 1:
             time_context = "tomorrow"
         elif days_until < 7:
-            time_context = f"this {appointment_dt.strftime('%A')}"
+            time_context = f"this {_WEEKDAY_LABELS[appointment_dt.weekday()]}"
         
         recipient_msg = "" if recipient.lower() == 'self' else f" for {recipient}"
         
@@ -783,7 +1364,7 @@ def book_appointment(phone_number: str, entities: Dict) -> Dict:
                       f"You'll receive a reminder 24 hours and 1 hour before your appointment. Your confirmation number is #{appointment_id}. Is there anything else I can help you with?"
         }
     except Exception as e:
-        logger.error(f"Error booking appointment: {e}")
+        logger.error("Error booking appointment: %s", e)
         return {
             'success': False,
             'message': "I apologize, but I encountered an issue while booking your appointment. Could you please try again with a specific date and time? For example, 'tomorrow at 2pm' or 'Friday at 10am'."
@@ -793,18 +1374,18 @@ def parse_datetime(datetime_str: str) -> Optional[datetime]:
     """Parse a natural language date and time expression."""
     try:
         # Log input for debugging
-        logger.debug(f"Parsing datetime string: '{datetime_str}'")
-        real_current_time = datetime.now()
-        current_year = real_current_time.year
-        current_month = real_current_time.month
-        logger.debug(f"Real current time: {real_current_time} (Year: {current_year}, Month: {current_month})")
+        logger.debug("Parsing datetime string: '%s'", datetime_str)
+        now = get_current_datetime()
+        current_year = now.year
+        current_month = now.month
+        logger.debug("Current time: %s (Year: %s, Month: %s)", now, current_year, current_month)
         
-        # Handle special cases first
+        # Handle special cases first; everything below works on the lowercased string
         datetime_str = datetime_str.lower()
         
         # Handle "tomorrow" directly
         if "tomorrow" in datetime_str:
-            base_date = get_current_datetime().date() + timedelta(days=1)
+            base_date = now.date() + timedelta(days=1)
             # Extract time part
             time_part = datetime_str.replace("tomorrow", "").strip()
             if "at" in time_part:
@@ -812,35 +1393,39 @@ def parse_datetime(datetime_str: str) -> Optional[datetime]:
                 
             # Parse time part
             if time_part:
-                time_match = re.search(r"(\d+)(?::(\d+))?\s*(am|pm)?", time_part, re.IGNORECASE)
+                time_match = _TIME_RE.search(time_part)
                 if time_match:
                     hour = int(time_match.group(1))
                     minute = int(time_match.group(2) or 0)
                     am_pm = time_match.group(3)
                     
-                    if am_pm and am_pm.lower() == "pm" and hour < 12:
+                    if am_pm and am_pm == "pm" and hour < 12:
                         hour += 12
-                    elif am_pm and am_pm.lower() == "am" and hour == 12:
+                    elif am_pm and am_pm == "am" and hour == 12:
                         hour = 0
                     
                     result = datetime.combine(base_date, time(hour, minute))
-                    logger.debug(f"Parsed 'tomorrow' with time: {result}")
+                    logger.debug("Parsed 'tomorrow' with time: %s", result)
                     return result
             
             # Default to noon if no valid time
             result = datetime.combine(base_date, time(12, 0))
-            logger.debug(f"Parsed 'tomorrow', defaulted to noon: {result}")
+            logger.debug("Parsed 'tomorrow', defaulted to noon: %s", result)
             return result
             
+        # Cheap prefilter: the ISO and MM/DD patterns both need digits, so plain
+        # natural-language input like "next friday" skips those regexes entirely
+        has_digits = any(ch.isdigit() for ch in datetime_str)
+
         # Check for ISO format dates (YYYY-MM-DD)
-        iso_match = re.match(r'(\d{4})-(\d{1,2})-(\d{1,2})', datetime_str)
+        iso_match = _ISO_DATE_RE.match(datetime_str) if datetime_str[:1].isdigit() else None
         if iso_match:
             year = int(iso_match.group(1))
             month = int(iso_match.group(2))
             day = int(iso_match.group(3))
             
             # Extract time part
-            time_part = re.sub(r'\d{4}-\d{1,2}-\d{1,2}', '', datetime_str).strip()
+            time_part = datetime_str[iso_match.end():].strip()
             if 'at' in time_part:
                 time_part = time_part.split('at')[1].strip()
                 
@@ -849,15 +1434,15 @@ def parse_datetime(datetime_str: str) -> Optional[datetime]:
                 return datetime(year, month, day, 12, 0)
                 
             # Try to parse time part
-            time_match = re.search(r'(\d+)(?::(\d+))?\s*(am|pm)?', time_part, re.IGNORECASE)
+            time_match = _TIME_RE.search(time_part)
             if time_match:
                 hour = int(time_match.group(1))
                 minute = int(time_match.group(2) or 0)
                 am_pm = time_match.group(3)
                 
-                if am_pm and am_pm.lower() == 'pm' and hour < 12:
+                if am_pm and am_pm == 'pm' and hour < 12:
                     hour += 12
-                elif am_pm and am_pm.lower() == 'am' and hour == 12:
+                elif am_pm and am_pm == 'am' and hour == 12:
                     hour = 0
                     
                 return datetime(year, month, day, hour, minute)
@@ -865,100 +1450,63 @@ def parse_datetime(datetime_str: str) -> Optional[datetime]:
                 # Default to noon
                 return datetime(year, month, day, 12, 0)
                 
-        # For "day of week" like "Friday"
-        days = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
-        for i, day in enumerate(days):
-            if day in datetime_str.lower() or day[:3] in [word.lower() for word in datetime_str.split()]:
-                # Important - use real current date for accurate day calculations
-                now = datetime.now()
-                current_year = now.year
-                current_month = now.month
-                logger.debug(f"Current date/time: {now} (Year: {current_year}, Month: {current_month})")
-                today_weekday = now.weekday()  # 0 = Monday
-                logger.debug(f"Today is weekday {today_weekday} ({days[today_weekday]})")
-                days_ahead = (i - today_weekday) % 7
-                
-                # Check for "this" keyword to ensure we're looking at the correct week
-                if "this" in datetime_str.lower():
-                    # If days_ahead is large (like 5-6 days), it's still this week
-                    logger.debug(f"'this' keyword found, ensuring we use current week")
-                    # If we're already past that day this week, use next week
-                    if days_ahead == 0 and now.hour >= CLOSING_HOUR:
-                        days_ahead = 7
-                        logger.debug(f"Today is {day} but after business hours, going to next week")
-                
-                # If days_ahead is 0, it means today - check if we should go to next week
-                # If we're looking for the current day but it's already past business hours,
-                # go to next week instead
-                elif days_ahead == 0:
-                    if now.hour >= CLOSING_HOUR:
-                        days_ahead = 7
-                        logger.debug(f"Today is {day} but after business hours, going to next week")
-                # If days_ahead is small, it means this week - if today is Friday and target
-                # is Sunday, days_ahead would be 2
-                elif days_ahead < 7:
-                    logger.debug(f"Next {day} is in {days_ahead} days")
-                
-                # Check for "next" keyword to push forward another week
-                if "next" in datetime_str.lower():
-                    # "Next Friday" means not this Friday, but the one after
-                    if days_ahead < 7:
-                        days_ahead += 7
-                        logger.debug(f"'next' keyword found, adding 7 days")
-                
-                logger.debug(f"Day of week '{day}' (i={i}), today={today_weekday} ({days[today_weekday]}), days_ahead={days_ahead}")
-                target_date = now.date() + timedelta(days=days_ahead)
-                logger.debug(f"Calculated target_date: {target_date} (Year: {target_date.year}, Month: {target_date.month})")
-                
-                # Extract the time part by removing the day name and "next" if present
-                time_parts = []
-                for word in datetime_str.split():
-                    word_lower = word.lower()
-                    if (word_lower not in [day, day[:3], "next", "this", "on", "the"] and 
-                        "at" not in word_lower and 
-                        word_lower not in ["am", "pm"]):
-                        time_parts.append(word)
+        # For "day of week" like "Friday" - if several are mentioned, the one
+        # earliest in the week (Monday first) wins, not the first in the text
+        tokens = set(_WORD_RE.findall(datetime_str))
+        weekday_hits = [i for i in map(_weekday_of, tokens) if i is not None]
+        if weekday_hits:
+            i = min(weekday_hits)
+            day = _WEEKDAY_NAMES[i]
+            today_weekday = now.weekday()  # 0 = Monday
+            logger.debug("Today is weekday %s (%s)", today_weekday, _WEEKDAY_NAMES[today_weekday])
+            days_ahead = (i - today_weekday) % 7
+            
+            if "next" in tokens:
+                # "Next Friday" means not this Friday, but the one after
+                days_ahead += 7
+                logger.debug("'next' keyword found, adding 7 days")
+            elif days_ahead == 0 and now.hour >= CLOSING_HOUR:
+                # Asking for today (or "this" today) after business hours means next week
+                days_ahead = 7
+                logger.debug("Today is %s but after business hours, going to next week", day)
+            
+            logger.debug("Day of week '%s' (i=%s), today=%s (%s), days_ahead=%s", day, i, today_weekday, _WEEKDAY_NAMES[today_weekday], days_ahead)
+            target_date = now.date() + timedelta(days=days_ahead)
+            logger.debug("Calculated target_date: %s (Year: %s, Month: %s)", target_date, target_date.year, target_date.month)
+            
+            # Extract the time part by removing the day name and "next" if present
+            time_parts = []
+            for word in datetime_str.split():
+                if (word not in [day, day[:3], "next", "this", "on", "the"] and 
+                    "at" not in word and 
+                    word not in {"am", "pm"}):
+                    time_parts.append(word)
+            
+            time_str = " ".join(time_parts).replace("at", "").strip()
+            
+            # One pattern covers "3", "3pm" and "3:30pm"
+            time_match = _TIME_RE.search(time_str)
+            if time_match:
+                hour = int(time_match.group(1))
+                minute = int(time_match.group(2) or 0)
+                am_pm = time_match.group(3)
                 
-                time_str = " ".join(time_parts).replace("at", "").strip()
+                if am_pm == "pm" and hour < 12:
+                    hour += 12
+                elif am_pm == "am" and hour == 12:
+                    hour = 0
                 
-                if ":" in time_str:
-                    hour, minute = time_str.split(":")
-                    hour = int(hour)
-                    if "pm" in minute.lower() and hour < 12:
-                        hour += 12
-                    minute = int(minute.replace("am", "").replace("pm", "").strip())
-                    result = datetime.combine(target_date, time(hour, minute))
-                    logger.debug(f"Parsed time with colon: {result}")
-                    return result
-                elif time_str:
-                    # Try to parse just the time
-                    time_match = re.search(r"(\d+)\s*(am|pm)?", time_str)
-                    if time_match:
-                        hour = int(time_match.group(1))
-                        am_pm = time_match.group(2)
-                        
-                        if am_pm and am_pm.lower() == "pm" and hour < 12:
-                            hour += 12
-                        elif am_pm and am_pm.lower() == "am" and hour == 12:
-                            hour = 0
-                        
-                        result = datetime.combine(target_date, time(hour, 0))
-                        logger.debug(f"Parsed time from regex: {result}")
-                        return result
-                    else:
-                        # Default to noon
-                        result = datetime.combine(target_date, time(12, 0))
-                        logger.debug(f"No valid time format, defaulting to noon: {result}")
-                        return result
-                else:
-                    # Default to noon if no time specified
-                    result = datetime.combine(target_date, time(12, 0))
-                    logger.debug(f"No time specified, defaulting to noon: {result}")
-                    return result
+                result = datetime.combine(target_date, time(hour, minute))
+                logger.debug("Parsed time from regex: %s", result)
+                return result
+            else:
+                # Default to noon if no time specified
+                result = datetime.combine(target_date, time(12, 0))
+                logger.debug("No valid time specified, defaulting to noon: %s", result)
+                return result
 
         # Handle specific date patterns first (MM/DD/YYYY or DD/MM/YYYY)
-        date_pattern = r'(\d{1,2})[/-](\d{1,2})(?:[/-](\d{2,4}))?'
-        date_match = re.search(date_pattern, datetime_str)
+        date_match = _DATE_RE.search(datetime_str) if has_digits else None
         if date_match:
             # Got a date in format MM/DD or MM/DD/YY or similar
             month = int(date_match.group(1))
@@ -974,38 +1522,37 @@ def parse_datetime(datetime_str: str) -> Optional[datetime]:
                 # Swap month and day if month > 12 (assumes American format)
                 month, day = day, month
             
-            logger.debug(f"Parsed specific date pattern: year={year}, month={month}, day={day}")
+            logger.debug("Parsed specific date pattern: year=%s, month=%s, day=%s", year, month, day)
             
             # Extract time
-            time_part = re.sub(date_pattern, '', datetime_str).strip()
+            time_part = (datetime_str[:date_match.start()] + datetime_str[date_match.end():]).strip()
             time_obj = time(12, 0)  # Default to noon
             
             if time_part:
-                time_match = re.search(r'(\d+)(?::(\d+))?\s*(am|pm)?', time_part, re.IGNORECASE)
+                time_match = _TIME_RE.search(time_part)
                 if time_match:
                     hour = int(time_match.group(1))
                     minute = int(time_match.group(2) or 0)
                     am_pm = time_match.group(3)
                     
-                    if am_pm and am_pm.lower() == 'pm' and hour < 12:
+                    if am_pm and am_pm == 'pm' and hour < 12:
                         hour += 12
-                    elif am_pm and am_pm.lower() == 'am' and hour == 12:
+                    elif am_pm and am_pm == 'am' and hour == 12:
                         hour = 0
                         
                     time_obj = time(hour, minute)
             
             try:
-                now = datetime.now()
                 parsed_dt = datetime(year, month, day, time_obj.hour, time_obj.minute)
-                logger.debug(f"Created datetime from specific pattern: {parsed_dt}")
+                logger.debug("Created datetime from specific pattern: %s", parsed_dt)
                 
                 # If it's in the past, move it to next month or year
                 if parsed_dt < now and abs((parsed_dt - now).days) > 1:
                     # More than 1 day in the past, use next year
                     parsed_dt = parsed_dt.replace(year=current_year+1)
-                    logger.debug(f"Date was in the past, moved to next year: {parsed_dt}")
+                    logger.debug("Date was in the past, moved to next year: %s", parsed_dt)
                 
-                logger.debug(f"Final parsed result: {parsed_dt}")
+                logger.debug("Final parsed result: %s", parsed_dt)
                 return parsed_dt
             except ValueError as e:
                 logger.error(f"Invalid date from pattern: {e}")
@@ -1017,17 +1564,16 @@ def parse_datetime(datetime_str: str) -> Optional[datetime]:
             try:
                 from dateutil.parser import parse
                 parsed_dt = parse(datetime_str, fuzzy=True)
-                logger.debug(f"dateutil parse result: {parsed_dt}, detected year: {parsed_dt.year}")
+                logger.debug("dateutil parse result: %s, detected year: %s", parsed_dt, parsed_dt.year)
                 
-                now = datetime.now()
                 # Always force current year if the parsed year is far in the future or past
                 if abs(parsed_dt.year - current_year) > 1:
-                    logger.debug(f"Year {parsed_dt.year} is far from current year {current_year}, forcing current year")
+                    logger.debug("Year %s is far from current year %s, forcing current year", parsed_dt.year, current_year)
                     try:
                         parsed_dt = parsed_dt.replace(year=current_year)
                     except ValueError:
                         # Handle Feb 29 in leap years
-                        if parsed_dt.month == 2 and parsed_dt.day == 29 and not (current_year % 4 == 0):
+                        if parsed_dt.month == 2 and parsed_dt.day == 29 and not calendar.isleap(current_year):
                             parsed_dt = parsed_dt.replace(month=2, day=28, year=current_year)
                         else:
                             logger.error(f"Error replacing year: {parsed_dt}")
@@ -1038,19 +1584,19 @@ def parse_datetime(datetime_str: str) -> Optional[datetime]:
                     # The only exception is if we're near year boundaries
                     if not ((current_month == 12 and parsed_dt.month <= 2) or 
                             (current_month <= 2 and parsed_dt.month == 12)):
-                        logger.debug(f"Month {parsed_dt.month} is far from current month {current_month}, forcing current month")
+                        logger.debug("Month %s is far from current month %s, forcing current month", parsed_dt.month, current_month)
                         try:
                             # Calculate correct day for the month
-                            max_day = [31, 29 if current_year % 4 == 0 else 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31][current_month-1]
+                            max_day = calendar.monthrange(current_year, current_month)[1]
                             day = min(parsed_dt.day, max_day)
                             parsed_dt = parsed_dt.replace(month=current_month, day=day)
                         except ValueError as e:
                             logger.error(f"Error in month correction: {e}")
                 
                 # If the parser didn't extract a good time, default to noon
-                if parsed_dt.hour == 0 and parsed_dt.minute == 0 and "am" not in datetime_str.lower() and "pm" not in datetime_str.lower():
+                if parsed_dt.hour == 0 and parsed_dt.minute == 0 and "am" not in datetime_str and "pm" not in datetime_str:
                     parsed_dt = datetime.combine(parsed_dt.date(), time(12, 0))
-                    logger.debug(f"No clear time found, defaulting to noon: {parsed_dt}")
+                    logger.debug("No clear time found, defaulting to noon: %s", parsed_dt)
                 
                 # If the date is in the past, move it to the future
                 if parsed_dt < now:
@@ -1060,7 +1606,7 @@ def parse_datetime(datetime_str: str) -> Optional[datetime]:
                             # Use tomorrow if it's past current time
                             fixed_date = (now + timedelta(days=1)).date()
                             parsed_dt = datetime.combine(fixed_date, parsed_dt.time())
-                            logger.debug(f"Time is in the past today, moving to tomorrow: {parsed_dt}")
+                            logger.debug("Time is in the past today, moving to tomorrow: %s", parsed_dt)
                     else:
                         # Past date - check if it's in this year but earlier months
                         if parsed_dt.year == current_year:
@@ -1074,14 +1620,14 @@ def parse_datetime(datetime_str: str) -> Optional[datetime]:
                                 
                                 try:
                                     parsed_dt = parsed_dt.replace(year=next_year, month=next_month)
-                                    logger.debug(f"Date is in the past this year, moved to next month: {parsed_dt}")
+                                    logger.debug("Date is in the past this year, moved to next month: %s", parsed_dt)
                                 except ValueError:
                                     # Handle month with fewer days
-                                    last_day = [31, 29 if next_year % 4 == 0 else 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31][next_month-1]
+                                    last_day = calendar.monthrange(next_year, next_month)[1]
                                     parsed_dt = parsed_dt.replace(year=next_year, month=next_month, day=min(parsed_dt.day, last_day))
-                                    logger.debug(f"Adjusted for month length: {parsed_dt}")
+                                    logger.debug("Adjusted for month length: %s", parsed_dt)
                 
-                logger.debug(f"Final parsed result: {parsed_dt} (Year: {parsed_dt.year}, Month: {parsed_dt.month}, Day: {parsed_dt.day})")
+                logger.debug("Final parsed result: %s (Year: %s, Month: %s, Day: %s)", parsed_dt, parsed_dt.year, parsed_dt.month, parsed_dt.day)
                 return parsed_dt
             except ImportError:
                 logger.error("Failed to import dateutil.parser.parse")
@@ -1098,24 +1644,40 @@ def is_during_business_hours(dt: datetime) -> bool:
     """Check if the appointment time is during business hours."""
     return OPENING_HOUR <= dt.hour < CLOSING_HOUR
 
-def is_slot_available(dt: datetime) -> bool:
-    """Check if the appointment time slot is available."""
+def nearest_slots(slots: Slots, target_minutes: int, k: int, pool: Optional[int] = None) -> List[str]:
+    """Return the labels of the k slots starting closest to target_minutes.
+    
+    Only the first pool slots are considered when pool is given.
+    """
+    minutes, labels = slots.start_minutes[:pool], slots.ordered
+    closest = heapq.nsmallest(k, range(len(minutes)), key=lambda i: (abs(minutes[i] - target_minutes), labels[i]))
+    return [labels[i] for i in closest]
+
+def is_slot_available(dt: datetime, available_slots: Optional[Slots] = None) -> bool:
+    """Check if the appointment time slot is available.
+    
+    Pass the day's available_slots when they were already fetched.
+    """
     # Check if it's a valid appointment time
     if not is_valid_appointment_time(dt):
         return False
     
     # Check if the slot is available
-    available_slots = get_available_slots(dt.strftime("%Y-%m-%d"))
-    return dt.strftime("%I:%M %p") in available_slots
+    if available_slots is None:
+        available_slots = get_available_slots(dt.strftime("%Y-%m-%d"))
+    return dt.strftime("%I:%M %p") in available_slots.index
 
-def book_appointment_slot(phone_number: str, dt: datetime, service_type: str, recipient: str = "self") -> str:
+def book_appointment_slot(phone_number: str, dt: datetime, service_type: str, recipient: str = "self",
+                          now: Optional[datetime] = None) -> str:
     """Book a specific appointment slot."""
     # Get customer information if available
     customer_info = get_customer_info(phone_number)
     customer_name = customer_info.get('name', '')
     
     # Create a new appointment
-    appointment_id = f"APPT-{int(get_current_datetime().timestamp())}"
+    if now is None:
+        now = get_current_datetime()
+    appointment_id = f"APPT-{_ID_EPOCH}-{next(_ID_COUNTER)}"
     new_appointment = {
         'id': appointment_id,
         'phone': phone_number,
@@ -1123,7 +1685,7 @@ def book_appointment_slot(phone_number: str, dt: datetime, service_type: str, re
         'service_type': service_type,
         'recipient': recipient,  # Add recipient field
         'customer_name': customer_name,  # Add customer name
-        'created_at': get_current_datetime().strftime("%Y-%m-%d %H:%M:%S")
+        'created_at': now.strftime("%Y-%m-%d %H:%M:%S")
     }
     
     logger.info(f"Attempting to book appointment: {new_appointment}")
@@ -1144,6 +1706,8 @@ def schedule_reminder(phone_number: str, appointment_id: str, reminder_dt: datet
 
 def cancel_appointment(phone: str, entities: Dict[str, Any]) -> Dict[str, Any]:
     """Cancel an existing appointment."""
+    if _booking_system_down():
+        return {'success': False, 'message': SHEETS_UNAVAILABLE_MESSAGE}
     try:
         # Find the appointment
         appointment_id = entities.get('appointment_id')
@@ -1157,15 +1721,14 @@ def cancel_appointment(phone: str, entities: Dict[str, Any]) -> Dict[str, Any]:
         
         # Cancel the appointment
         if remove_appointment_from_sheet(appointment['id']):
-            appt_datetime = dateutil_parse(appointment['datetime'])
+            appt_datetime = _appointment_dt(appointment)
             
-            # Notify the barber about the cancellation
-            barber_phone = os.environ.get('BARBER_PHONE_NUMBER', '+12345678901')
-            notify_barber_of_cancellation(barber_phone, phone, appt_datetime)
+            # Notify the barber about the cancellation without holding up the reply
+            _run_io([(notify_barber_of_cancellation, BARBER_PHONE, phone, appt_datetime)], wait=False)
             
             return {
                 'success': True,
-                'message': f"Your appointment for {appt_datetime.strftime('%A, %B %d at %I:%M %p')} has been canceled."
+                'message': f"Your appointment for {_appointment_label(appointment)} has been canceled."
             }
         else:
             return {
@@ -1182,6 +1745,8 @@ def cancel_appointment(phone: str, entities: Dict[str, Any]) -> Dict[str, Any]:
 
 def reschedule_appointment(phone: str, entities: Dict[str, Any]) -> Dict[str, Any]:
     """Reschedule an existing appointment."""
+    if _booking_system_down():
+        return {'success': False, 'message': SHEETS_UNAVAILABLE_MESSAGE}
     try:
         # Extract entities
         date_str = entities.get('date')
@@ -1219,32 +1784,31 @@ def reschedule_appointment(phone: str, entities: Dict[str, Any]) -> Dict[str, An
                 'message': f"Sorry, we can't reschedule to that time. We're open Monday to Saturday from {OPENING_HOUR}am to {CLOSING_HOUR}pm."
             }
         
-        # Check if the slot is available
-        available_slots = get_available_slots(date_str)
-        new_time_str = new_datetime.strftime("%I:%M %p")
-        if new_time_str not in available_slots:
+        # Check if the slot is available on the parsed date
+        available_slots = get_available_slots(new_datetime.strftime("%Y-%m-%d"))
+        if new_datetime.strftime("%I:%M %p") not in available_slots.index:
             return {
                 'success': False,
-                'message': f"Sorry, that time slot is not available. Here are the available times on {new_datetime.strftime('%A, %B %d')}: {', '.join(available_slots)}"
+                'message': f"Sorry, that time slot is not available. Here are the available times on {_fmt_date(new_datetime.year, new_datetime.month, new_datetime.day)}: {', '.join(available_slots.ordered)}"
             }
         
-        # Update the appointment
-        old_datetime = dateutil_parse(appointment['datetime'])
+        # Update the appointment - keep the old time and label before the record changes
+        old_datetime = _appointment_dt(appointment)
+        old_label = _appointment_label(appointment)
         new_data = {
             'datetime': new_datetime.strftime("%Y-%m-%d %H:%M:%S")
         }
         
         if update_appointment_in_sheet(appointment['id'], new_data):
-            # Schedule reminders for the new time
-            schedule_reminders(phone, new_datetime)
-            
-            # Notify the barber about the reschedule
-            barber_phone = os.environ.get('BARBER_PHONE_NUMBER', '+12345678901')
-            notify_barber_of_reschedule(barber_phone, phone, old_datetime, new_datetime)
+            # Schedule reminders for the new time and notify the barber in parallel
+            _run_io([
+                (schedule_reminders, phone, new_datetime),
+                (notify_barber_of_reschedule, BARBER_PHONE, phone, old_datetime, new_datetime),
+            ])
             
             return {
                 'success': True,
-                'message': f"Your appointment has been rescheduled from {old_datetime.strftime('%A, %B %d at %I:%M %p')} to {new_datetime.strftime('%A, %B %d at %I:%M %p')}. You'll receive a reminder 24 hours and 1 hour before your appointment.",
+                'message': f"Your appointment has been rescheduled from {old_label} to {format_appointment_time(new_datetime)}. You'll receive a reminder 24 hours and 1 hour before your appointment.",
                 'appointment_time': new_datetime
             }
         else:
@@ -1262,21 +1826,23 @@ def reschedule_appointment(phone: str, entities: Dict[str, Any]) -> Dict[str, An
 
 def get_upcoming_appointments(phone: str) -> str:
     """Get a list of upcoming appointments for a customer."""
+    if _booking_system_down():
+        return SHEETS_UNAVAILABLE_MESSAGE
     try:
-        appointments = get_appointments_for_phone(phone)
+        # Same lookup the agent uses for limit checks; this only formats it
+        appointments = get_upcoming_appointments_raw(phone)
         
         if not appointments:
             return "You don't have any upcoming appointments."
         
-        result = "Your upcoming appointments:\n"
+        lines = ["Your upcoming appointments:"]
         for idx, appt in enumerate(appointments[:5], 1):  # Show up to 5 upcoming appointments
-            dt = dateutil_parse(appt['datetime'])
             recipient_info = ""
             if 'recipient' in appt and appt['recipient'] and appt['recipient'].lower() != 'self':
                 recipient_info = f" for {appt['recipient']}"
-            result += f"{idx}. {dt.strftime('%A, %B %d at %I:%M %p')}{recipient_info} - {appt['service_type']}\n"
+            lines.append(f"{idx}. {_appointment_label(appt)}{recipient_info} - {appt['service_type']}")
         
-        return result
+        return "\n".join(lines) + "\n"
     
     except Exception as e:
         logger.error(f"Error getting upcoming appointments: {e}")
@@ -1307,6 +1873,8 @@ def get_upcoming_appointments_raw(phone: str) -> List[Dict[str, Any]]:
 
 def check_availability(date_str: str = None) -> str:
     """Check availability for a given date and return available time slots."""
+    if _booking_system_down():
+        return SHEETS_UNAVAILABLE_MESSAGE
     try:
         now = get_current_datetime()
         
@@ -1321,16 +1889,17 @@ def check_availability(date_str: str = None) -> str:
             requested_date_str = date_str.strip()
             
             # If date is in ISO format (YYYY-MM-DD)
-            if re.match(r'^\d{4}-\d{2}-\d{2}$', requested_date_str):
+            if _ISO_RE.match(requested_date_str):
                 target_date = datetime.strptime(requested_date_str, "%Y-%m-%d").date()
                 logger.info(f"Parsed as ISO format date: {target_date}")
             else:
-                # Try to interpret as a date string
+                # Try the fixed formats before falling back to dateutil
                 try:
-                    parsed_date = dateutil_parse(requested_date_str, fuzzy=True)
-                    target_date = parsed_date.date()
+                    target_date = _parse_fixed_date(requested_date_str)
+                    if target_date is None:
+                        target_date = dateutil_parse(requested_date_str, fuzzy=True).date()
                     requested_date_str = target_date.strftime("%Y-%m-%d")
-                    logger.info(f"Parsed date using dateutil: {target_date}")
+                    logger.info(f"Parsed date string: {target_date}")
                 except:
                     # Default to tomorrow if parsing fails
                     target_date = now.date() + timedelta(days=1)
@@ -1360,19 +1929,20 @@ def check_availability(date_str: str = None) -> str:
         # Format the response
         formatted_date = format_date_for_display(requested_date_str)
         
-        if not available_slots:
+        if not available_slots.ordered:
             nearby_dates = []
-            # Check next 3 business days for availability
-            for i in range(1, 4):
-                check_date = target_date + timedelta(days=i)
+            # Check the next 3 days for availability, skipping days we're closed
+            check_dates = [
+                check_date for check_date in (target_date + timedelta(days=i) for i in range(1, 4))
+                if check_date.weekday() in WORKING_DAYS
+            ]
+            # Fetch the appointments for all of them in one go; the slots are then
+            # worked out in memory, so there is no I/O left to run in parallel
+            appointments_by_date = get_appointments_for_dates(check_dates)
+            for check_date in check_dates:
                 check_date_str = check_date.strftime("%Y-%m-%d")
-                
-                # Skip Sundays
-                if check_date.weekday() == 6:  # Sunday
-                    continue
-                    
-                nearby_slots = get_available_slots(check_date_str)
-                if nearby_slots:
+                nearby_slots = get_available_slots(check_date_str, existing_appointments=appointments_by_date[check_date])
+                if nearby_slots.ordered:
                     nearby_dates.append(check_date_str)
             
             if nearby_dates:
@@ -1386,16 +1956,14 @@ def check_availability(date_str: str = None) -> str:
         afternoon_slots = []
         evening_slots = []
         
-        for slot in available_slots:
-            slot_time = dateutil_parse(slot).time()
-            formatted_time = datetime.strptime(f"{slot_time.hour}:{slot_time.minute}", "%H:%M").strftime("%I:%M %p")
-            
-            if slot_time.hour < 12:
-                morning_slots.append(formatted_time)
-            elif slot_time.hour < 17:
-                afternoon_slots.append(formatted_time)
+        # The slot labels are already "%I:%M %p"; bucket them by their start hour
+        for slot, minutes in zip(available_slots.ordered, available_slots.start_minutes):
+            if minutes < 12 * 60:
+                morning_slots.append(slot)
+            elif minutes < 17 * 60:
+                afternoon_slots.append(slot)
             else:
-                evening_slots.append(formatted_time)
+                evening_slots.append(slot)
         
         response = f"Available slots for {formatted_date}:"
         
@@ -1406,13 +1974,14 @@ def check_availability(date_str: str = None) -> str:
         if evening_slots:
             response += f"\nEvening: {', '.join(evening_slots)}"
         
-        logger.info(f"Returning availability for {requested_date_str} with {len(available_slots)} slots")
+        logger.info(f"Returning availability for {requested_date_str} with {len(available_slots.ordered)} slots")
         return response
         
     except Exception as e:
         logger.error(f"Error checking availability: {e}")
         return "I'm having trouble checking appointment availability right now. Please try again later or contact us directly."
 
+@functools.lru_cache(maxsize=512)
 def is_working_day(date_str: str) -> bool:
     """Check if a date is a working day."""
     try:
@@ -1422,6 +1991,7 @@ def is_working_day(date_str: str) -> bool:
         logger.error(f"Error checking if date is a working day: {e}")
         return False
 
+@functools.lru_cache(maxsize=512)
 def format_date_for_display(date_str: str) -> str:
     """Format a date string (YYYY-MM-DD) for user-friendly display."""
     try:
@@ -1432,49 +2002,111 @@ def format_date_for_display(date_str: str) -> str:
         return date_str
 
 # Add functions to save and retrieve customer data
+def _load_customers(customer_sheet) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, int]]:
+    """Read every customer from the Customers sheet.
+    
+    Returns the customers and their sheet row numbers, both keyed by phone number.
+    """
+    customers = {}
+    rows = {}
+    for row, row_data in enumerate(customer_sheet.get_all_values()[1:], 2):
+        if not row_data or not row_data[0] or row_data[0] in rows:
+            continue
+        rows[row_data[0]] = row
+        if len(row_data) < 5:
+            continue
+        try:
+            preferences = json.loads(row_data[3]) if row_data[3] else {}
+        except ValueError as e:
+            logger.error(f"Error reading preferences for customer {row_data[0]}: {e}")
+            continue
+        customers[row_data[0]] = {
+            "phone": row_data[0],
+            "name": row_data[1],
+            "email": row_data[2],
+            "preferences": preferences,
+            "last_updated": row_data[4]
+        }
+    return customers, rows
+
+def _get_customers_worksheet(client, create: bool = False):
+    """Get the Customers worksheet, looking it up only once per connection.
+    
+    With create=True a missing worksheet is created with its header row.
+    """
+    global _customers_worksheet
+    if _customers_worksheet is None:
+        sheet = client.open_by_key(SHEET_ID)
+        try:
+            _customers_worksheet = sheet.worksheet("Customers")
+            logger.info("Found existing Customers worksheet")
+        except gspread.exceptions.WorksheetNotFound:
+            if not create:
+                raise
+            # Create the worksheet
+            logger.info("Creating new Customers worksheet")
+            customer_sheet = sheet.add_worksheet(title="Customers", rows=100, cols=10)
+            # Add headers
+            customer_sheet.append_row(["phone", "name", "email", "preferences", "last_updated"])
+            _customers_worksheet = customer_sheet
+    return _customers_worksheet
+
+def _customer_cache(client, customer_sheet=None) -> Dict[str, Any]:
+    """Return the customer cache, reloading the sheet when it is stale."""
+    with _customer_cache_lock:
+        if sleep_time.monotonic() - _CUSTOMER_CACHE["ts"] > CUSTOMER_CACHE_TTL:
+            if customer_sheet is None:
+                customer_sheet = _get_customers_worksheet(client)
+            _CUSTOMER_CACHE["data"], _CUSTOMER_CACHE["rows"] = _load_customers(customer_sheet)
+            _CUSTOMER_CACHE["ts"] = sleep_time.monotonic()
+        return _CUSTOMER_CACHE
+
+def _remember_customer(phone_number: str, customer_info: Dict[str, Any], last_updated: str,
+                       row: Optional[int] = None):
+    """Apply a saved customer to the cache so lookups see it before the next reload."""
+    with _customer_cache_lock:
+        if row:
+            _CUSTOMER_CACHE["rows"][phone_number] = row
+        entry = _CUSTOMER_CACHE["data"].setdefault(phone_number, {
+            "phone": phone_number, "name": "", "email": "", "preferences": {}
+        })
+        for key in ("name", "email", "preferences"):
+            if key in customer_info:
+                entry[key] = customer_info[key]
+        entry["last_updated"] = last_updated
+
 @rate_limited
 def save_customer_info(phone_number: str, customer_info: Dict[str, Any]) -> bool:
     """Save or update customer information in the database."""
+    last_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     client = get_sheet_client()
     
     if client:
         try:
             # Check if we have a Customer Info sheet
-            sheet = client.open_by_key(SHEET_ID)
-            customer_sheet = None
+            customer_sheet = _get_customers_worksheet(client, create=True)
             
+            # Check if customer already exists, scanning the sheet only on a cache miss
             try:
-                customer_sheet = sheet.worksheet("Customers")
-                logger.info("Found existing Customers worksheet")
-            except:
-                # Create the worksheet
-                logger.info("Creating new Customers worksheet")
-                customer_sheet = sheet.add_worksheet(title="Customers", rows=100, cols=10)
-                # Add headers
-                customer_sheet.append_row(["phone", "name", "email", "preferences", "last_updated"])
-            
-            # Check if customer already exists
-            try:
-                cell = customer_sheet.find(phone_number)
-                if cell:
+                row = _customer_cache(client, customer_sheet)["rows"].get(phone_number)
+                if row is None:
+                    cell = customer_sheet.find(phone_number)
+                    row = cell.row if cell else None
+                if row:
                     # Update existing customer
-                    row = cell.row
                     logger.info(f"Updating existing customer at row {row}")
                     
-                    # Get existing data
-                    existing_data = customer_sheet.row_values(row)
-                    logger.info(f"Existing data: {existing_data}")
-                    
-                    # Update cells
+                    # Write the given fields and the last_updated timestamp in a single request
+                    updates = []
                     if 'name' in customer_info:
-                        customer_sheet.update_cell(row, 2, customer_info['name'])
+                        updates.append({'range': f'B{row}', 'values': [[customer_info['name']]]})
                     if 'email' in customer_info:
-                        customer_sheet.update_cell(row, 3, customer_info['email'])
+                        updates.append({'range': f'C{row}', 'values': [[customer_info['email']]]})
                     if 'preferences' in customer_info:
-                        customer_sheet.update_cell(row, 4, json.dumps(customer_info['preferences']))
-                    
-                    # Update last_updated timestamp
-                    customer_sheet.update_cell(row, 5, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+                        updates.append({'range': f'D{row}', 'values': [[json.dumps(customer_info['preferences'])]]})
+                    updates.append({'range': f'E{row}', 'values': [[last_updated]]})
+                    customer_sheet.batch_update(updates, value_input_option='USER_ENTERED')
+                    _remember_customer(phone_number, customer_info, last_updated, row)
                     return True
                 else:
                     # Add new customer
@@ -1484,9 +2116,11 @@ def save_customer_info(phone_number: str, customer_info: Dict[str, Any]) -> bool
                         customer_info.get('name', ''),
                         customer_info.get('email', ''),
                         json.dumps(customer_info.get('preferences', {})),
-                        datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                        last_updated
                     ]
-                    customer_sheet.append_row(row_data)
+                    result = customer_sheet.append_row(row_data)
+                    match = _UPDATED_ROW_RE.search((result or {}).get('updates', {}).get('updatedRange', ''))
+                    _remember_customer(phone_number, customer_info, last_updated, int(match.group(1)) if match else None)
                     return True
             except Exception as e:
                 logger.error(f"Error updating customer data: {e}")
@@ -1495,44 +2129,38 @@ def save_customer_info(phone_number: str, customer_info: Dict[str, Any]) -> bool
         except Exception as e:
             logger.error(f"Error saving customer info: {e}")
             return False
+    elif sheets_unavailable():
+        logger.error(f"Google Sheets unavailable, not saving customer info for {phone_number}")
+        return False
     else:
         # Use the mock database
         logger.info(f"Using mock database to store customer info for {phone_number}")
         MOCK_DB["customers"][phone_number] = {
             **customer_info,
-            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            "last_updated": last_updated
         }
         return True
 
 @rate_limited
 def get_customer_info(phone_number: str) -> Dict[str, Any]:
-    """Retrieve customer information from the database."""
+    """Retrieve customer information from the database.
+    
+    Served from an in-memory copy of the Customers sheet that is reloaded
+    every CUSTOMER_CACHE_TTL seconds.
+    """
     client = get_sheet_client()
     
     if client:
         try:
-            customer_sheet = client.open_by_key(SHEET_ID).worksheet("Customers")
-            try:
-                cell = customer_sheet.find(phone_number)
-                if cell:
-                    # Get data for this customer
-                    row_data = customer_sheet.row_values(cell.row)
-                    if len(row_data) >= 5:
-                        return {
-                            "phone": row_data[0],
-                            "name": row_data[1],
-                            "email": row_data[2],
-                            "preferences": json.loads(row_data[3]) if row_data[3] else {},
-                            "last_updated": row_data[4]
-                        }
-                # Customer not found
-                return {}
-            except Exception as e:
-                logger.error(f"Error finding customer: {e}")
-                return {}
+            customer = _customer_cache(client)["data"].get(phone_number)
+            # Empty dict when the customer isn't found
+            return dict(customer) if customer else {}
         except Exception as e:
             logger.error(f"Error getting customer info: {e}")
             return {}
+    elif sheets_unavailable():
+        logger.warning("Google Sheets unavailable, not reading customer info")
+        return {}
     else:
         # Use the mock database
         logger.info(f"Using mock database to retrieve customer info for {phone_number}")
@@ -1,10 +1,14 @@
 import os
+import re
 from twilio.rest import Client
 from datetime import datetime, timedelta
 import logging
 from typing import Union, Dict
 from apscheduler.schedulers.background import BackgroundScheduler
+from services.scheduler import scheduler as _scheduler
 import requests
+from requests.adapters import HTTPAdapter
+import concurrent.futures
 from dotenv import load_dotenv
 from twilio.base.exceptions import TwilioRestException
 
@@ -28,11 +32,15 @@ TELEGRAM_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN')
 BARBER_TELEGRAM_ID = os.environ.get('BARBER_TELEGRAM_ID', '')  # Telegram ID of the barber
 BARBER_BOT_TOKEN = os.environ.get('BARBER_BOT_TOKEN', '')  # Separate bot token for barber notifications
 
-# Track reminders and notifications
-scheduled_reminders = {}
+# Phone numbers Twilio can send to, in E.164 format ("+15551234567")
+_E164_RE = re.compile(r"^\+[1-9]\d{7,14}$")
 
-# Initialize scheduler (shared with app.py)
-scheduler = None
+# Shared HTTP session so Telegram sends reuse open connections to the API
+_tg_session = requests.Session()
+_tg_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+# Barber notification channels are sent in parallel on these threads
+_NOTIFY_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="notify")
 
 # Initialize Twilio client
 try:
@@ -48,6 +56,13 @@ def get_twilio_client():
     """Get Twilio client or None if credentials not available."""
     return twilio_client
 
+def _split_channel(number: str) -> tuple:
+    """Split a stored phone number into its channel and address.
+    
+    Telegram users are stored as "+tg<user id>"; anything else is an SMS number.
+    """
+    return ('tg', number[3:]) if number.startswith('+tg') else ('sms', number)
+
 def send_telegram_message(chat_id: str, message: str, use_barber_bot: bool = False) -> bool:
     """Send a message via Telegram API"""
     # Determine which token to use
@@ -58,8 +73,13 @@ def send_telegram_message(chat_id: str, message: str, use_barber_bot: bool = Fal
         return False
     
     # Remove the +tg prefix if present
-    if chat_id.startswith('+tg'):
-        chat_id = chat_id[3:]
+    _, chat_id = _split_channel(chat_id)
+    
+    # Skip the API call for sends that can't succeed; chat IDs are integers (negative
+    # for groups) or a public channel's "@username"
+    if not message or not (chat_id.lstrip('-').isdigit() or (chat_id.startswith('@') and len(chat_id) > 1)):
+        logger.warning(f"Not sending Telegram message to invalid chat ID '{chat_id}' or with empty text")
+        return False
     
     try:
         url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
@@ -68,7 +88,7 @@ def send_telegram_message(chat_id: str, message: str, use_barber_bot: bool = Fal
             "text": message,
             "parse_mode": "Markdown"
         }
-        response = requests.post(url, data=data, timeout=10)
+        response = _tg_session.post(url, data=data, timeout=10)
         
         if response.status_code == 200:
             logger.info(f"Telegram message sent to {chat_id} using {'barber bot' if use_barber_bot else 'customer bot'}: {message}")
@@ -93,6 +113,11 @@ def send_sms(to_number: str, message: str) -> bool:
         logger.info(f"Skipping SMS to Telegram user {to_number}")
         return False
     
+    # Skip the API call for sends that can't succeed
+    if not message or not _E164_RE.match(to_number):
+        logger.warning(f"Not sending SMS to invalid number '{to_number}' or with empty text")
+        return False
+    
     try:
         # Real SMS sending
         sms = twilio_client.messages.create(
@@ -126,6 +151,10 @@ def send_hour_before_reminder(to_number: str, appointment_time: datetime) -> boo
     result = send_sms(to_number, message)
     return result
 
+def get_scheduler() -> BackgroundScheduler:
+    """Get the shared scheduler from services.scheduler."""
+    return _scheduler
+
 def schedule_reminders(to_number: str, appointment_time: datetime) -> bool:
     """Schedule reminders for 24 hours and 1 hour before the appointment."""
     try:
@@ -134,24 +163,15 @@ def schedule_reminders(to_number: str, appointment_time: datetime) -> bool:
         reminder_1h = appointment_time - timedelta(hours=1)
         now = datetime.now()
         
-        # Get the global scheduler
-        global scheduler
-        if scheduler is None:
-            from app import scheduler as app_scheduler
-            scheduler = app_scheduler
+        scheduler = get_scheduler()
         
         # Schedule the 24-hour reminder if it's in the future
         job_id_24h = f"reminder_24h_{to_number}_{int(appointment_time.timestamp())}"
         if reminder_24h > now:
             logger.info(f"Scheduling 24-hour reminder for {to_number} at {reminder_24h}")
             
-            # Remove any existing reminder for this appointment
-            for job in scheduler.get_jobs():
-                if job.id == job_id_24h:
-                    logger.info(f"Removing existing 24h reminder job {job_id_24h}")
-                    job.remove()
-            
-            # Schedule the new 24-hour reminder
+            # Schedule the new 24-hour reminder; replace_existing
+            # swaps out any earlier reminder for this appointment
             scheduler.add_job(
                 send_appointment_reminder,
                 'date',
@@ -160,15 +180,6 @@ def schedule_reminders(to_number: str, appointment_time: datetime) -> bool:
                 id=job_id_24h,
                 replace_existing=True
             )
-            
-            # Track the scheduled reminder
-            scheduled_reminders[job_id_24h] = {
-                "phone": to_number,
-                "appointment_time": appointment_time,
-                "reminder_time": reminder_24h,
-                "type": "24h reminder",
-                "scheduled_at": datetime.now()
-            }
         else:
             logger.warning(f"Not scheduling 24h reminder for {to_number} as reminder time {reminder_24h} is in the past")
         
@@ -177,13 +188,8 @@ def schedule_reminders(to_number: str, appointment_time: datetime) -> bool:
         if reminder_1h > now:
             logger.info(f"Scheduling 1-hour reminder for {to_number} at {reminder_1h}")
             
-            # Remove any existing reminder for this appointment
-            for job in scheduler.get_jobs():
-                if job.id == job_id_1h:
-                    logger.info(f"Removing existing 1h reminder job {job_id_1h}")
-                    job.remove()
-            
-            # Schedule the new 1-hour reminder
+            # Schedule the new 1-hour reminder; replace_existing
+            # swaps out any earlier reminder for this appointment
             scheduler.add_job(
                 send_hour_before_reminder,
                 'date',
@@ -192,15 +198,6 @@ def schedule_reminders(to_number: str, appointment_time: datetime) -> bool:
                 id=job_id_1h,
                 replace_existing=True
             )
-            
-            # Track the scheduled reminder
-            scheduled_reminders[job_id_1h] = {
-                "phone": to_number,
-                "appointment_time": appointment_time,
-                "reminder_time": reminder_1h,
-                "type": "1h reminder",
-                "scheduled_at": datetime.now()
-            }
         else:
             logger.warning(f"Not scheduling 1h reminder for {to_number} as reminder time {reminder_1h} is in the past")
         
@@ -211,8 +208,61 @@ def schedule_reminders(to_number: str, appointment_time: datetime) -> bool:
         return False
 
 def get_scheduled_reminders() -> Dict:
-    """Get all currently scheduled reminders."""
-    return scheduled_reminders
+    """Get all currently scheduled reminders, read from the scheduler's pending jobs."""
+    reminders = {}
+    for job in get_scheduler().get_jobs():
+        if not job.id.startswith("reminder_"):
+            continue
+        to_number, appointment_time = job.args
+        reminders[job.id] = {
+            "phone": to_number,
+            "appointment_time": appointment_time,
+            "reminder_time": getattr(job, 'next_run_time', None) or job.trigger.run_date,
+            "type": "24h reminder" if job.id.startswith("reminder_24h_") else "1h reminder"
+        }
+    return reminders
+
+def _send_barber_telegram(message: str) -> bool:
+    """Send a message to the barber's Telegram chat.
+    
+    Uses the dedicated barber bot when one is configured and the regular
+    customer bot otherwise (or when the barber bot fails to send).
+    """
+    if BARBER_BOT_TOKEN and send_telegram_message(BARBER_TELEGRAM_ID, message, use_barber_bot=True):
+        return True
+    return send_telegram_message(BARBER_TELEGRAM_ID, message)
+
+def _notify_barber(barber_phone: str, message: str, event: str) -> bool:
+    """Send a barber notification over SMS and Telegram at the same time.
+    
+    Args:
+        barber_phone: The barber's phone number
+        message: The notification text
+        event: What the notification is about, used in the log line
+        
+    Returns:
+        True if any channel delivered the message, False otherwise
+    """
+    sends = []
+    
+    # Try SMS if Twilio is configured
+    if twilio_client and TWILIO_PHONE_NUMBER:
+        sends.append(_NOTIFY_POOL.submit(send_sms, barber_phone, message))
+    
+    # Try Telegram once if the barber's ID is configured
+    if BARBER_TELEGRAM_ID:
+        sends.append(_NOTIFY_POOL.submit(_send_barber_telegram, message))
+    
+    # Wait for every channel; the senders log and swallow their own errors
+    notification_sent = any([send.result() for send in sends])
+    
+    # Log outcome
+    if notification_sent:
+        logger.info(f"Successfully sent {event} notification to barber")
+    else:
+        logger.warning(f"Failed to send any {event} notifications to barber")
+    
+    return notification_sent
 
 def notify_barber_of_booking(barber_phone: str, customer_phone: str, appointment_time: datetime, recipient: str = "self") -> bool:
     """Notify the barber about a new booking.
@@ -229,42 +279,14 @@ def notify_barber_of_booking(barber_phone: str, customer_phone: str, appointment
     formatted_time = appointment_time.strftime("%A, %B %d at %I:%M %p")
     
     # Get customer info - could be a phone number or Telegram ID
-    if customer_phone.startswith('+tg'):
-        customer_info = f"Telegram user {customer_phone.replace('+tg', '')}"
-    else:
-        customer_info = customer_phone
+    channel, customer_id = _split_channel(customer_phone)
+    customer_info = f"Telegram user {customer_id}" if channel == 'tg' else customer_id
     
     # Include recipient information if not 'self'
     recipient_info = "" if recipient.lower() == "self" else f" for {recipient}"
     
-    # Create the notification message
     message = f"📅 *New Appointment*\nTime: {formatted_time}\nCustomer: {customer_info}{recipient_info}"
-    
-    # Send via different notification channels
-    notification_sent = False
-    
-    # Try SMS if Twilio is configured
-    if twilio_client and TWILIO_PHONE_NUMBER:
-        sms_sent = send_sms(barber_phone, message)
-        notification_sent = notification_sent or sms_sent
-    
-    # Try Telegram with regular customer bot if barber's ID is configured
-    if BARBER_TELEGRAM_ID:
-        telegram_sent = send_telegram_message(BARBER_TELEGRAM_ID, message)
-        notification_sent = notification_sent or telegram_sent
-    
-    # Try dedicated barber bot if configured
-    if BARBER_BOT_TOKEN and BARBER_TELEGRAM_ID:
-        barber_bot_sent = send_telegram_message(BARBER_TELEGRAM_ID, message, use_barber_bot=True)
-        notification_sent = notification_sent or barber_bot_sent
-    
-    # Log outcome
-    if notification_sent:
-        logger.info(f"Successfully sent booking notification to barber for appointment at {formatted_time}")
-    else:
-        logger.warning(f"Failed to send any booking notifications to barber for appointment at {formatted_time}")
-    
-    return notification_sent
+    return _notify_barber(barber_phone, message, f"booking for {formatted_time}")
 
 def notify_barber_of_cancellation(barber_phone: str, customer_phone: str, appointment_time: datetime) -> bool:
     """Notify the barber about a cancelled appointment.
@@ -279,28 +301,8 @@ def notify_barber_of_cancellation(barber_phone: str, customer_phone: str, appoin
     """
     formatted_time = appointment_time.strftime("%A, %B %d at %I:%M %p")
     
-    # Create the notification message
     message = f"❌ *Cancelled Appointment*\nTime: {formatted_time}\nCustomer: {customer_phone}"
-    
-    # Send via different notification channels
-    notification_sent = False
-    
-    # Try SMS if Twilio is configured
-    if twilio_client and TWILIO_PHONE_NUMBER:
-        sms_sent = send_sms(barber_phone, message)
-        notification_sent = notification_sent or sms_sent
-    
-    # Try Telegram with regular customer bot if barber's ID is configured
-    if BARBER_TELEGRAM_ID:
-        telegram_sent = send_telegram_message(BARBER_TELEGRAM_ID, message)
-        notification_sent = notification_sent or telegram_sent
-    
-    # Try dedicated barber bot if configured
-    if BARBER_BOT_TOKEN and BARBER_TELEGRAM_ID:
-        barber_bot_sent = send_telegram_message(BARBER_TELEGRAM_ID, message, use_barber_bot=True)
-        notification_sent = notification_sent or barber_bot_sent
-    
-    return notification_sent
+    return _notify_barber(barber_phone, message, f"cancellation for {formatted_time}")
 
 def notify_barber_of_reschedule(barber_phone: str, customer_phone: str, old_time: datetime, new_time: datetime) -> bool:
     """Notify the barber about a rescheduled appointment.
@@ -317,31 +319,8 @@ def notify_barber_of_reschedule(barber_phone: str, customer_phone: str, old_time
     old_formatted = old_time.strftime("%A, %B %d at %I:%M %p")
     new_formatted = new_time.strftime("%A, %B %d at %I:%M %p")
     
-    # Create the notification message
-    message = f"🔄 *Rescheduled Appointment*\n"
-    message += f"Customer: {customer_phone}\n"
-    message += f"From: {old_formatted}\n"
-    message += f"To: {new_formatted}"
-    
-    # Send via different notification channels
-    notification_sent = False
-    
-    # Try SMS if Twilio is configured
-    if twilio_client and TWILIO_PHONE_NUMBER:
-        sms_sent = send_sms(barber_phone, message)
-        notification_sent = notification_sent or sms_sent
-    
-    # Try Telegram with regular customer bot if barber's ID is configured
-    if BARBER_TELEGRAM_ID:
-        telegram_sent = send_telegram_message(BARBER_TELEGRAM_ID, message)
-        notification_sent = notification_sent or telegram_sent
-    
-    # Try dedicated barber bot if configured
-    if BARBER_BOT_TOKEN and BARBER_TELEGRAM_ID:
-        barber_bot_sent = send_telegram_message(BARBER_TELEGRAM_ID, message, use_barber_bot=True)
-        notification_sent = notification_sent or barber_bot_sent
-    
-    return notification_sent
+    message = f"🔄 *Rescheduled Appointment*\nCustomer: {customer_phone}\nFrom: {old_formatted}\nTo: {new_formatted}"
+    return _notify_barber(barber_phone, message, f"reschedule to {new_formatted}")
 
 def send_booking_confirmation(phone_number: str, appointment_time: datetime, service_type: str, appointment_id: str) -> bool:
     """Send a booking confirmation to the customer.
@@ -362,10 +341,10 @@ def send_booking_confirmation(phone_number: str, appointment_time: datetime, ser
     message = f"✅ *Booking Confirmed*\n\nYour {service_type} is scheduled for {formatted_time}.\n\nReference #: {appointment_id}\n\nYou'll receive a reminder 24 hours and 1 hour before your appointment."
     
     # Determine message type based on phone number
-    if phone_number.startswith('+tg'):
-        # Extract Telegram user ID from phone number
-        user_id = phone_number.replace("+tg", "")
-        return send_telegram_message(user_id, message)
+    channel, address = _split_channel(phone_number)
+    if channel == 'tg':
+        # Send to the Telegram user ID behind the phone number
+        return send_telegram_message(address, message)
     else:
         # Send SMS for regular phone numbers
         return send_sms(phone_number, message) 
\ No newline at end of file
@@ -0,0 +1,47 @@
+import os
+import atexit
+import logging
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.jobstores.memory import MemoryJobStore
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Reminder jobs are kept in a database so pending reminders survive a restart
+REMINDERS_DB_URL = os.environ.get("REMINDERS_DB_URL", "sqlite:///reminders.db")
+
+# How often the running scheduler rechecks the shared job store for
+# reminders that other processes (e.g. the Telegram bot) have added
+JOB_STORE_POLL_SECONDS = 60
+
+# The one scheduler for the app. Every process that books appointments starts
+# it: the web process (app.py) runs the reminders, other processes start it
+# paused so they only write their jobs to the shared job store.
+scheduler = BackgroundScheduler(jobstores={
+    'default': SQLAlchemyJobStore(url=REMINDERS_DB_URL),
+    'local': MemoryJobStore(),
+})
+
+def _poll_job_store():
+    """No-op job; running it makes the scheduler re-read the shared job store."""
+
+def start_scheduler(paused: bool = False) -> BackgroundScheduler:
+    """Start the shared scheduler.
+    
+    Only the web process should run reminders; everything else that books
+    appointments passes paused=True so its jobs are just saved to the job store.
+    """
+    if not scheduler.running:
+        scheduler.start(paused=paused)
+        if not paused:
+            # Jobs added by other processes don't wake this scheduler, so poll for them
+            scheduler.add_job(_poll_job_store, 'interval', seconds=JOB_STORE_POLL_SECONDS,
+                              id='job_store_poll', jobstore='local', replace_existing=True)
+        # Register shutdown function to properly clean up scheduler
+        atexit.register(lambda: scheduler.shutdown())
+        logger.info(f"Reminder scheduler started{' (paused)' if paused else ''} with job store {REMINDERS_DB_URL}")
+    return scheduler
@@ -5,12 +5,14 @@ This script guides you through all the necessary setup steps.
 """
 
 import os
+import importlib
+import importlib.util
+import shutil
 import subprocess
 import sys
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Top-level packages the system needs, checked by check_dependencies
+REQUIRED_MODULES = ("flask", "twilio", "gspread", "oauth2client", "dotenv", "apscheduler", "langchain")
 
 def print_header(title):
     """Print a section header."""
@@ -20,21 +22,16 @@ def print_header(title):
 
 def check_dependencies():
     """Check if all required dependencies are installed."""
-    try:
-        import flask
-        import twilio
-        import gspread
-        import oauth2client
-        import dotenv
-        import apscheduler
-        import langchain
-        
-        print("✅ All required Python packages are installed.")
-        return True
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}")
+    # Only look the packages up; importing them would run their (slow) init code
+    missing = [module for module in REQUIRED_MODULES if importlib.util.find_spec(module) is None]
+    
+    if missing:
+        print(f"❌ Missing dependencies: {', '.join(missing)}")
         print("Please run: pip install -r requirements.txt")
         return False
+    
+    print("✅ All required Python packages are installed.")
+    return True
 
 def check_env_file():
     """Check if .env file exists and has basic structure."""
@@ -44,9 +41,7 @@ def check_env_file():
         
         if os.path.exists(".env.example"):
             # Copy .env.example to .env
-            with open(".env.example", "r") as example:
-                with open(".env", "w") as env:
-                    env.write(example.read())
+            shutil.copyfile(".env.example", ".env")
             print("✅ Created .env file. You'll need to update it with your credentials.")
         else:
             print("❌ .env.example file not found! Please create a .env file manually.")
@@ -57,7 +52,7 @@ def check_env_file():
         return True
 
 def run_setup_script(script_name, step_name):
-    """Run a setup script and wait for it to complete."""
+    """Run a setup script in its own process and wait for it to complete."""
     print(f"\nRunning {step_name}...")
     try:
         subprocess.run(["python", script_name], check=True)
@@ -70,6 +65,35 @@ def run_setup_script(script_name, step_name):
         print(f"\n❌ {script_name} not found!")
         return False
 
+def run_setup_module(module_name, step_name):
+    """Run a setup module's checks in this process.
+    
+    Cheaper than run_setup_script since the interpreter and the Twilio and
+    Google client libraries are only loaded once.
+    """
+    print(f"\nRunning {step_name}...")
+    try:
+        # Re-read .env, and the step's settings with it, so edits made since
+        # the previous step are picked up
+        importlib.reload(importlib.import_module("env_config"))
+        if module_name in sys.modules:
+            module = importlib.reload(sys.modules[module_name])
+        else:
+            module = importlib.import_module(module_name)
+        ok = module.run()
+    except SystemExit as e:
+        # A step calling sys.exit() only ends that step, as it did when run as a script
+        ok = e.code in (None, 0)
+    except Exception as e:
+        print(f"\n❌ {step_name} failed: {e}")
+        return False
+    
+    if ok:
+        print(f"\n✅ {step_name} completed.")
+    else:
+        print(f"\n❌ {step_name} failed. Please check the errors above.")
+    return ok
+
 def setup_webhooks():
     """Provide guidance on setting up webhooks."""
     print("\n--- Setting Up Webhooks ---")
@@ -115,7 +139,7 @@ def main():
     print("- Account SID and Auth Token")
     print("- A phone number with SMS capabilities")
     input("Press Enter when you're ready to continue...")
-    twilio_ok = run_setup_script("setup_twilio.py", "Twilio setup")
+    twilio_ok = run_setup_module("setup_twilio", "Twilio setup")
     
     # Step 4: Set up Google Sheets
     print_header("Step 4: Setting Up Google Sheets")
@@ -124,7 +148,7 @@ def main():
     print("- A service account with a JSON key file")
     print("- A Google Sheet shared with the service account")
     input("Press Enter when you're ready to continue...")
-    sheets_ok = run_setup_script("setup_google.py", "Google Sheets setup")
+    sheets_ok = run_setup_module("setup_google", "Google Sheets setup")
     
     # Step 5: Set up webhooks
     print_header("Step 5: Setting Up Webhooks")
@@ -7,12 +7,12 @@ This script guides you through the process and checks your setup.
 import os
 import json
 import sys
-from dotenv import load_dotenv, set_key
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from env_config import ENV
+from dotenv import set_key
 
-# Load environment variables
-load_dotenv()
+# Google settings, read once for all the checks below
+CREDS_FILE = ENV.get('GOOGLE_SHEETS_CREDENTIALS_FILE', 'credentials.json')
+SHEET_ID = ENV.get('GOOGLE_SHEET_ID')
 
 def print_step(step_num, step_text):
     """Print a step in the setup process."""
@@ -20,7 +20,7 @@ def print_step(step_num, step_text):
 
 def check_credentials_file():
     """Check if the credentials.json file exists."""
-    creds_file = os.environ.get('GOOGLE_SHEETS_CREDENTIALS_FILE', 'credentials.json')
+    creds_file = CREDS_FILE
     if not os.path.exists(creds_file):
         print(f"❌ Credentials file '{creds_file}' not found!")
         print("   Please download your service account JSON key and save it as 'credentials.json'")
@@ -51,26 +51,20 @@ def check_credentials_file():
 
 def check_sheet_id():
     """Check if the sheet ID is set in the environment variables."""
-    sheet_id = os.environ.get('GOOGLE_SHEET_ID')
+    global SHEET_ID
+    sheet_id = SHEET_ID
     if not sheet_id or sheet_id == 'your_google_sheet_id_here':
         print("❌ Google Sheet ID not set in .env file!")
         
         # Ask for the Sheet ID
         new_id = input("Enter your Google Sheet ID: ").strip()
         if new_id:
-            # Update the .env file
-            with open('.env', 'r') as f:
-                env_lines = f.readlines()
-            
-            with open('.env', 'w') as f:
-                for line in env_lines:
-                    if line.startswith('GOOGLE_SHEET_ID='):
-                        f.write(f'GOOGLE_SHEET_ID={new_id}\n')
-                    else:
-                        f.write(line)
+            # Update the .env file (adds the line if it isn't there yet)
+            set_key('.env', 'GOOGLE_SHEET_ID', new_id, quote_mode='never')
             
             print("✅ Updated .env file with new Google Sheet ID!")
             os.environ['GOOGLE_SHEET_ID'] = new_id
+            SHEET_ID = new_id
             return True
         return False
     else:
@@ -79,29 +73,27 @@ def check_sheet_id():
 
 def test_sheet_access():
     """Test if we can access the Google Sheet."""
-    creds_file = os.environ.get('GOOGLE_SHEETS_CREDENTIALS_FILE', 'credentials.json')
-    sheet_id = os.environ.get('GOOGLE_SHEET_ID')
+    creds_file = CREDS_FILE
+    sheet_id = SHEET_ID
     
     if not os.path.exists(creds_file) or not sheet_id:
         print("❌ Cannot test sheet access - missing credentials or sheet ID.")
         return False
     
+    # Imported here so the earlier checks don't pay for loading gspread
+    from google_client import get_sheet, write_appointment_headers
+    
     try:
-        # Setup the credentials
-        scopes = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-        creds = ServiceAccountCredentials.from_json_keyfile_name(creds_file, scopes)
-        client = gspread.authorize(creds)
-        
         # Try to open the sheet
-        sheet = client.open_by_key(sheet_id)
-        worksheets = sheet.worksheets()
+        sheet = get_sheet(creds_file, sheet_id)
+        worksheet_titles = [ws.title for ws in sheet.worksheets()]
         
         print(f"✅ Successfully connected to Google Sheet!")
         print(f"   Sheet title: {sheet.title}")
-        print(f"   Worksheets: {', '.join([ws.title for ws in worksheets])}")
+        print(f"   Worksheets: {', '.join(worksheet_titles)}")
         
         # Check if we already have the Appointments worksheet
-        if 'Appointments' in [ws.title for ws in worksheets]:
+        if 'Appointments' in worksheet_titles:
             print("✅ 'Appointments' worksheet already exists!")
         else:
             # Ask if we should create it
@@ -110,7 +102,7 @@ def test_sheet_access():
                 # Create the worksheet
                 worksheet = sheet.add_worksheet(title='Appointments', rows=100, cols=5)
                 # Add headers
-                worksheet.update('A1:E1', [['id', 'phone', 'datetime', 'service_type', 'created_at']])
+                write_appointment_headers(worksheet)
                 print("✅ Created 'Appointments' worksheet with headers!")
         
         return True
@@ -122,8 +114,12 @@ def test_sheet_access():
         print("   - Are the APIs enabled in Google Cloud Console?")
         return False
 
-def main():
-    """Run the Google Sheets setup assistant."""
+def run() -> bool:
+    """Run the Google Sheets setup assistant.
+    
+    Returns:
+        True if every check passed, False otherwise
+    """
     print("\n=== Google Sheets Setup Assistant ===\n")
     print("This script will help you set up and test your Google Sheets integration.")
     
@@ -149,11 +145,15 @@ def main():
     print(f"Google Sheet ID: {'✅ OK' if sheet_id_ok else '❌ Missing/Invalid'}")
     print(f"Sheet Access: {'✅ OK' if access_ok else '❌ Failed'}")
     
-    if creds_ok and sheet_id_ok and access_ok:
+    all_ok = creds_ok and sheet_id_ok and access_ok
+    
+    if all_ok:
         print("\n🎉 Google Sheets integration is ready to use!")
         print("You can now run the barber appointment system.")
     else:
         print("\n⚠️ Please fix the issues above before continuing.")
+    
+    return all_ok
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    run() 
\ No newline at end of file
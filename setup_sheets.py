@@ -4,19 +4,12 @@ Script to set up Google Sheets for the barber appointment system.
 Run this script once to create the required worksheet and headers.
 """
 
-import os
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from dotenv import load_dotenv
+from env_config import ENV
 import sys
 
-# Load environment variables
-load_dotenv()
-
 # Get Google Sheets credentials
-SCOPES = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-CREDS_FILE = os.environ.get('GOOGLE_SHEETS_CREDENTIALS_FILE')
-SHEET_ID = os.environ.get('GOOGLE_SHEET_ID')
+CREDS_FILE = ENV.get('GOOGLE_SHEETS_CREDENTIALS_FILE')
+SHEET_ID = ENV.get('GOOGLE_SHEET_ID')
 
 def setup_sheets():
     """Set up the Google Sheets structure for the appointment system."""
@@ -25,31 +18,34 @@ def setup_sheets():
         print("Make sure GOOGLE_SHEETS_CREDENTIALS_FILE and GOOGLE_SHEET_ID are set in .env")
         sys.exit(1)
         
+    # Imported here so a missing setting fails fast without loading gspread
+    import gspread
+    from google_client import get_sheet, write_appointment_headers
+    
     try:
         # Authenticate with Google Sheets API
         print(f"Authenticating with Google using credentials file: {CREDS_FILE}")
-        creds = ServiceAccountCredentials.from_json_keyfile_name(CREDS_FILE, SCOPES)
-        client = gspread.authorize(creds)
-        
         # Open the spreadsheet
         print(f"Opening spreadsheet with ID: {SHEET_ID}")
-        spreadsheet = client.open_by_key(SHEET_ID)
+        spreadsheet = get_sheet(CREDS_FILE, SHEET_ID)
         
-        # Check if Appointments worksheet already exists
-        worksheet_list = spreadsheet.worksheets()
-        worksheet_titles = [ws.title for ws in worksheet_list]
+        # Look up the Appointments worksheet directly by title
+        try:
+            appointments_sheet = spreadsheet.worksheet("Appointments")
+        except gspread.exceptions.WorksheetNotFound:
+            appointments_sheet = None
         
-        if "Appointments" in worksheet_titles:
+        if appointments_sheet:
             print("Appointments worksheet already exists.")
-            appointments_sheet = spreadsheet.worksheet("Appointments")
             
-            # Check if headers are already set
-            headers = appointments_sheet.row_values(1)
+            # Check if headers are already set (only the header cells are fetched)
+            header_rows = appointments_sheet.get('A1:E1')
+            headers = header_rows[0] if header_rows else []
             if headers and len(headers) >= 5:
                 print("Headers are already set.")
             else:
                 # Set headers
-                appointments_sheet.update('A1:E1', [['id', 'phone', 'datetime', 'service_type', 'created_at']])
+                write_appointment_headers(appointments_sheet)
                 print("Headers have been set.")
         else:
             # Create Appointments worksheet
@@ -57,7 +53,7 @@ def setup_sheets():
             appointments_sheet = spreadsheet.add_worksheet(title="Appointments", rows=100, cols=5)
             
             # Set headers
-            appointments_sheet.update('A1:E1', [['id', 'phone', 'datetime', 'service_type', 'created_at']])
+            write_appointment_headers(appointments_sheet)
             print("Appointments worksheet created with headers.")
         
         print("\nSetup complete! Your Google Sheet is ready to use with the barber appointment system.")
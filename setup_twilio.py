@@ -4,23 +4,34 @@ Helper script for setting up Twilio integration.
 This script guides you through the process and checks your setup.
 """
 
-import os
-import sys
-from dotenv import load_dotenv
-from twilio.rest import Client
-from twilio.base.exceptions import TwilioRestException, TwilioException
+import functools
+from env_config import ENV
 
-# Load environment variables
-load_dotenv()
+# Twilio settings, read once for all the checks below
+TWILIO_ACCOUNT_SID = ENV.get('TWILIO_ACCOUNT_SID')
+TWILIO_AUTH_TOKEN = ENV.get('TWILIO_AUTH_TOKEN')
+TWILIO_PHONE_NUMBER = ENV.get('TWILIO_PHONE_NUMBER')
+BARBER_PHONE_NUMBER = ENV.get('BARBER_PHONE_NUMBER')
 
 def print_step(step_num, step_text):
     """Print a step in the setup process."""
     print(f"\n--- Step {step_num}: {step_text} ---")
 
+@functools.lru_cache(maxsize=None)
+def get_twilio_client():
+    """Get the Twilio client, created once so every check reuses its connection."""
+    # Imported here so the checks that don't call Twilio skip loading its client
+    from twilio.rest import Client
+    return Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+
+def normalize_phone_number(phone_number):
+    """Add the leading plus sign Twilio uses if the number is missing it."""
+    return phone_number if phone_number.startswith('+') else '+' + phone_number
+
 def check_twilio_credentials():
     """Check if Twilio credentials are set in environment variables."""
-    account_sid = os.environ.get('TWILIO_ACCOUNT_SID')
-    auth_token = os.environ.get('TWILIO_AUTH_TOKEN')
+    account_sid = TWILIO_ACCOUNT_SID
+    auth_token = TWILIO_AUTH_TOKEN
     
     if not account_sid or account_sid == 'your_twilio_account_sid_here':
         print("❌ Twilio Account SID not set in .env file!")
@@ -37,7 +48,7 @@ def check_twilio_credentials():
 
 def check_twilio_phone_number():
     """Check if Twilio phone number is set in environment variables."""
-    phone_number = os.environ.get('TWILIO_PHONE_NUMBER')
+    phone_number = TWILIO_PHONE_NUMBER
     
     if not phone_number or phone_number == 'your_twilio_phone_number_here':
         print("❌ Twilio Phone Number not set in .env file!")
@@ -53,7 +64,7 @@ def check_twilio_phone_number():
 
 def check_barber_phone_number():
     """Check if barber phone number is set in environment variables."""
-    phone_number = os.environ.get('BARBER_PHONE_NUMBER')
+    phone_number = BARBER_PHONE_NUMBER
     
     if not phone_number or phone_number == 'your_phone_number_here':
         print("❌ Barber Phone Number not set in .env file!")
@@ -69,15 +80,17 @@ def check_barber_phone_number():
 
 def test_twilio_connection():
     """Test if we can connect to Twilio API."""
-    account_sid = os.environ.get('TWILIO_ACCOUNT_SID')
-    auth_token = os.environ.get('TWILIO_AUTH_TOKEN')
+    account_sid = TWILIO_ACCOUNT_SID
+    auth_token = TWILIO_AUTH_TOKEN
     
     if not account_sid or not auth_token or account_sid == 'your_twilio_account_sid_here' or auth_token == 'your_twilio_auth_token_here':
         print("❌ Cannot test Twilio connection - missing credentials.")
         return False
     
+    from twilio.base.exceptions import TwilioRestException
+    
     try:
-        client = Client(account_sid, auth_token)
+        client = get_twilio_client()
         
         # Just try to get account info to test the connection
         account = client.api.accounts(account_sid).fetch()
@@ -96,39 +109,37 @@ def test_twilio_connection():
 
 def verify_phone_number():
     """Verify that the Twilio phone number exists in your account."""
-    account_sid = os.environ.get('TWILIO_ACCOUNT_SID')
-    auth_token = os.environ.get('TWILIO_AUTH_TOKEN')
-    phone_number = os.environ.get('TWILIO_PHONE_NUMBER')
+    account_sid = TWILIO_ACCOUNT_SID
+    auth_token = TWILIO_AUTH_TOKEN
+    phone_number = TWILIO_PHONE_NUMBER
     
     if not account_sid or not auth_token or not phone_number:
         print("❌ Cannot verify phone number - missing credentials or phone number.")
         return False
     
     try:
-        client = Client(account_sid, auth_token)
+        client = get_twilio_client()
+        normalized_phone = normalize_phone_number(phone_number)
         
-        # Get list of phone numbers in the account
-        incoming_phone_numbers = client.incoming_phone_numbers.list()
-        phone_numbers = [number.phone_number for number in incoming_phone_numbers]
+        # Ask Twilio for just this number (the filter can also match partial
+        # numbers, so the results are still compared exactly)
+        matches = {number.phone_number for number in client.incoming_phone_numbers.list(phone_number=normalized_phone)}
         
-        # Check if our phone number is in the list
-        if phone_number in phone_numbers:
+        # Check if our phone number is in the account
+        if phone_number in matches:
             print(f"✅ Verified: Phone number {phone_number} exists in your Twilio account!")
             return True
+        elif normalized_phone in matches:
+            print(f"✅ Verified: Phone number {normalized_phone} exists in your Twilio account!")
+            print(f"   (Note: You should use this exact format in your .env file)")
+            return True
         else:
-            # Try normalizing the phone number format
-            normalized_phone = phone_number
-            if not normalized_phone.startswith('+'):
-                normalized_phone = '+' + normalized_phone
-            
-            if normalized_phone in phone_numbers:
-                print(f"✅ Verified: Phone number {normalized_phone} exists in your Twilio account!")
-                print(f"   (Note: You should use this exact format in your .env file)")
-                return True
+            # Only list every number in the account when there's no match to show
+            phone_numbers = {number.phone_number for number in client.incoming_phone_numbers.list()}
             
             print(f"❌ Phone number {phone_number} not found in your Twilio account!")
             print(f"   Your account has these phone numbers:")
-            for number in phone_numbers:
+            for number in sorted(phone_numbers):
                 print(f"   - {number}")
             return False
     except Exception as e:
@@ -137,10 +148,10 @@ def verify_phone_number():
 
 def send_test_message():
     """Send a test SMS message using Twilio."""
-    account_sid = os.environ.get('TWILIO_ACCOUNT_SID')
-    auth_token = os.environ.get('TWILIO_AUTH_TOKEN')
-    twilio_number = os.environ.get('TWILIO_PHONE_NUMBER')
-    barber_number = os.environ.get('BARBER_PHONE_NUMBER')
+    account_sid = TWILIO_ACCOUNT_SID
+    auth_token = TWILIO_AUTH_TOKEN
+    twilio_number = TWILIO_PHONE_NUMBER
+    barber_number = BARBER_PHONE_NUMBER
     
     if not account_sid or not auth_token or not twilio_number or not barber_number:
         print("❌ Cannot send test message - missing credentials or phone numbers.")
@@ -152,8 +163,10 @@ def send_test_message():
         print("Skipping test message.")
         return None
     
+    from twilio.base.exceptions import TwilioRestException
+    
     try:
-        client = Client(account_sid, auth_token)
+        client = get_twilio_client()
         
         message = client.messages.create(
             body="This is a test message from your Barber Appointment System. If you're receiving this, your Twilio setup is working!",
@@ -175,8 +188,12 @@ def send_test_message():
         print(f"❌ Error sending test message: {e}")
         return False
 
-def main():
-    """Run the Twilio setup assistant."""
+def run() -> bool:
+    """Run the Twilio setup assistant.
+    
+    Returns:
+        True if every check passed, False otherwise
+    """
     print("\n=== Twilio Setup Assistant ===\n")
     print("This script will help you set up and test your Twilio integration.")
     print("Make sure you have already:")
@@ -232,11 +249,15 @@ def main():
     else:
         print("Test Message: ⚠️ Skipped")
     
-    if creds_ok and twilio_number_ok and barber_number_ok and connection_ok and phone_verified:
+    all_ok = creds_ok and twilio_number_ok and barber_number_ok and connection_ok and phone_verified
+    
+    if all_ok:
         print("\n🎉 Twilio integration is ready to use!")
         print("You can now run the barber appointment system.")
     else:
         print("\n⚠️ Please fix the issues above before continuing.")
+    
+    return all_ok
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    run() 
\ No newline at end of file
@@ -2,10 +2,8 @@
 import os
 import logging
 import time
-import traceback
 from dotenv import load_dotenv
 import telebot
-from chains.agent import process_incoming_message, CONVERSATION_MEMORY_CACHE
 
 # Load environment variables
 load_dotenv()
@@ -24,28 +22,41 @@ if not TELEGRAM_TOKEN:
     logger.error("No TELEGRAM_BOT_TOKEN found in .env file!")
     exit(1)
 
-# Initialize the bot
-bot = telebot.TeleBot(TELEGRAM_TOKEN)
+# Imported after the token check so a missing token fails before langchain loads
+from chains.agent import process_incoming_message, CONVERSATION_MEMORY_CACHE
+from services.scheduler import start_scheduler
+
+# Initialize the bot; handlers run on a pool of worker threads so a slow
+# agent reply doesn't hold up messages from other users
+bot = telebot.TeleBot(TELEGRAM_TOKEN, threaded=True, num_threads=4)
+
+# Reply texts
+WELCOME_TEXT = (
+    "👋 Hi there! I'm your Barber Scheduling Assistant.\n\n"
+    "I can help you with:\n"
+    "• Booking appointments\n"
+    "• Checking availability\n"
+    "• Rescheduling appointments\n"
+    "• Canceling appointments\n"
+    "• Viewing your upcoming appointments\n\n"
+    "Just let me know what you need in natural language, like:\n"
+    "'Book a haircut tomorrow at 3pm'"
+)
+ERROR_REPLY = "Sorry, I encountered an error. Please try again."
+TOO_LONG_REPLY = "Sorry, that message is too long. Please keep it under 2000 characters."
+UNKNOWN_COMMAND_REPLY = "Sorry, I don't know that command. Send /help to see what I can do."
+
+# Longer messages are turned away before they reach the agent
+MAX_MESSAGE_LENGTH = 2000
 
 @bot.message_handler(commands=['start', 'help'])
 def handle_start_help(message):
     """Handle /start and /help commands"""
-    welcome_text = (
-        "👋 Hi there! I'm your Barber Scheduling Assistant.\n\n"
-        "I can help you with:\n"
-        "• Booking appointments\n"
-        "• Checking availability\n"
-        "• Rescheduling appointments\n"
-        "• Canceling appointments\n"
-        "• Viewing your upcoming appointments\n\n"
-        "Just let me know what you need in natural language, like:\n"
-        "'Book a haircut tomorrow at 3pm'"
-    )
-    bot.reply_to(message, welcome_text)
+    bot.reply_to(message, WELCOME_TEXT)
 
-@bot.message_handler(func=lambda message: True)
+@bot.message_handler(content_types=['text'])
 def handle_message(message):
-    """Handle all other messages"""
+    """Handle all other text messages"""
     try:
         # Extract user information
         chat_id = message.chat.id
@@ -53,44 +64,54 @@ def handle_message(message):
         first_name = message.from_user.first_name
         text = message.text
         
+        # Skip the agent for messages it can't do anything useful with
+        if not text or not text.strip():
+            return
+        if len(text) > MAX_MESSAGE_LENGTH:
+            bot.send_message(chat_id, TOO_LONG_REPLY)
+            return
+        # /start and /help have their own handler; other commands aren't for the agent
+        if text.startswith('/'):
+            bot.send_message(chat_id, UNKNOWN_COMMAND_REPLY)
+            return
+        
         # Create a pseudo phone number using Telegram ID
         phone_number = f"+tg{user_id}"
         
         logger.info(f"Received message from {first_name} (ID: {user_id}, phone: {phone_number})")
         logger.info(f"Message content: '{text}'")
         
-        # Debug - log the entire CONVERSATION_MEMORY_CACHE keys
-        memory_keys = list(CONVERSATION_MEMORY_CACHE.keys())
-        logger.info(f"Current conversation memory keys: {memory_keys}")
-        logger.info(f"CONVERSATION_MEMORY_CACHE object ID: {id(CONVERSATION_MEMORY_CACHE)}")
-        
-        # Check if this is a new or existing conversation
-        has_existing_conversation = phone_number in CONVERSATION_MEMORY_CACHE
-        if has_existing_conversation:
-            # Log details about the existing conversation
-            memory = CONVERSATION_MEMORY_CACHE[phone_number]
-            chat_history_length = len(memory.chat_memory.messages) if hasattr(memory, 'chat_memory') else 0
-            logger.info(f"Found existing conversation for {phone_number} with {chat_history_length} messages in history")
-            if chat_history_length > 0 and hasattr(memory, 'chat_memory'):
-                logger.info(f"Last message in history: '{memory.chat_memory.messages[-1].content}'")
-        else:
-            logger.info(f"Starting new conversation for {phone_number} - no previous memory found")
+        # Conversation memory diagnostics are only built when debug logging is on
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Current conversation memory keys: %s", list(CONVERSATION_MEMORY_CACHE.keys()))
+            logger.debug("CONVERSATION_MEMORY_CACHE object ID: %s", id(CONVERSATION_MEMORY_CACHE))
+            
+            # Check if this is a new or existing conversation
+            if phone_number in CONVERSATION_MEMORY_CACHE:
+                memory = CONVERSATION_MEMORY_CACHE[phone_number]
+                chat_history_length = len(memory.chat_memory.messages) if hasattr(memory, 'chat_memory') else 0
+                logger.debug("Found existing conversation for %s with %s messages in history", phone_number, chat_history_length)
+                if chat_history_length > 0:
+                    logger.debug("Last message in history: '%s'", memory.chat_memory.messages[-1].content)
+            else:
+                logger.debug("Starting new conversation for %s - no previous memory found", phone_number)
         
         # Process the message using our agent
         logger.info(f"Passing message to agent for processing: '{text}'")
         agent_response = process_incoming_message(phone_number, text)
         
         # Verify the conversation was stored properly after processing
-        if phone_number in CONVERSATION_MEMORY_CACHE:
+        if phone_number not in CONVERSATION_MEMORY_CACHE:
+            logger.warning(f"After processing: No conversation memory found for {phone_number}!")
+        elif debug:
             memory = CONVERSATION_MEMORY_CACHE[phone_number]
             chat_history_length = len(memory.chat_memory.messages) if hasattr(memory, 'chat_memory') else 0
-            logger.info(f"After processing: Conversation for {phone_number} has {chat_history_length} messages in history")
-            if chat_history_length > 0 and hasattr(memory, 'chat_memory'):
+            logger.debug("After processing: Conversation for %s has %s messages in history", phone_number, chat_history_length)
+            if chat_history_length > 0:
                 # Log the last few messages to verify context is maintained
-                last_msgs = memory.chat_memory.messages[-min(4, chat_history_length):]
-                logger.info(f"Last few messages in history: {[msg.content for msg in last_msgs]}")
-        else:
-            logger.warning(f"After processing: No conversation memory found for {phone_number}!")
+                last_msgs = memory.chat_memory.messages[-4:]
+                logger.debug("Last few messages in history: %s", [msg.content for msg in last_msgs])
         
         logger.info(f"Agent response: '{agent_response}'")
         
@@ -98,21 +119,21 @@ def handle_message(message):
         bot.send_message(chat_id, agent_response)
         
     except Exception as e:
-        logger.error(f"Error processing message: {e}")
-        logger.error(traceback.format_exc())
-        bot.send_message(message.chat.id, "Sorry, I encountered an error. Please try again.")
+        logger.exception(f"Error processing message: {e}")
+        bot.send_message(message.chat.id, ERROR_REPLY)
 
 def run_bot():
     """Run the bot with polling"""
     logger.info("Starting Telegram bot with polling...")
     try:
-        # Use a longer timeout and smaller interval for more responsive polling
-        bot.polling(none_stop=True, interval=2, timeout=60)
+        # Long-poll without a pause between requests, only fetching messages
+        bot.infinity_polling(timeout=60, long_polling_timeout=60, allowed_updates=['message'])
     except Exception as e:
-        logger.error(f"Polling error: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Polling error: {e}")
         time.sleep(15)  # Wait before trying to reconnect
 
 if __name__ == "__main__":
     logger.info("Telegram bot starting...")
+    # Save booked reminders to the shared job store; the web process sends them
+    start_scheduler(paused=True)
     run_bot() 
\ No newline at end of file
@@ -8,11 +8,18 @@ without requiring Twilio setup.
 import os
 from dotenv import load_dotenv
 from chains.agent import process_incoming_message
+from services.scheduler import start_scheduler
 import sys
 
 # Load environment variables
 load_dotenv()
 
+def read_piped_messages():
+    """Read a piped test script: the phone number on the first line, then one message per line."""
+    lines = sys.stdin.read().splitlines()
+    phone_number = (lines[0].strip() if lines else "") or "+1234567890"
+    return phone_number, lines[1:]
+
 def main():
     """Run an interactive test session with the agent."""
     print("Barber Agent Test Interface")
@@ -21,12 +28,20 @@ def main():
     print("The agent will respond just like it would via SMS.")
     print("Type 'exit' or 'quit' to end the session.\n")
     
-    # Get a test phone number
-    phone_number = input("Enter a test phone number (e.g. +1234567890): ") or "+1234567890"
+    interactive = sys.stdin.isatty()
+    if interactive:
+        # Get a test phone number
+        phone_number = input("Enter a test phone number (e.g. +1234567890): ") or "+1234567890"
+        # Prompt for each message until the user exits (input() never returns None)
+        messages = iter(lambda: input("\n> "), None)
+    else:
+        # Piped input (e.g. cat script.txt | python test_agent.py) is read in one go
+        phone_number, messages = read_piped_messages()
     
-    while True:
-        # Get user input
-        message = input("\n> ")
+    for message in messages:
+        if not interactive:
+            # Echo the scripted message so the transcript reads like a session
+            print(f"\n> {message}")
         
         # Check if the user wants to exit
         if message.lower() in ['exit', 'quit', 'q']:
@@ -48,5 +63,8 @@ if __name__ == "__main__":
         print("Warning: LANGSMITH_TRACING is not set. Setting to 'true' for testing.")
         os.environ['LANGSMITH_TRACING'] = "true"
     
+    # Save booked reminders to the shared job store; the web process sends them
+    start_scheduler(paused=True)
+    
     # Run the test interface
     main() 
\ No newline at end of file
@@ -1,13 +1,55 @@
 #!/usr/bin/env python
 import logging
+import os
+import re
 import sys
+import time
 import traceback
 from datetime import datetime, timedelta
 
-# Set up logging
-logging.basicConfig(level=logging.DEBUG)
+# Set up logging (BARBER_LOG_LEVEL=DEBUG shows parse_datetime's step-by-step logs)
+logging.basicConfig(level=os.environ.get("BARBER_LOG_LEVEL", "WARNING").upper())
 logger = logging.getLogger(__name__)
 
+# BARBER_QUIET_TB=1 prints just the exception instead of the full traceback
+QUIET_TRACEBACKS = os.environ.get("BARBER_QUIET_TB") == "1"
+
+def print_error_details():
+    """Print the exception being handled, as a full traceback unless QUIET_TRACEBACKS is set."""
+    if QUIET_TRACEBACKS:
+        print("".join(traceback.format_exception_only(*sys.exc_info()[:2])), end="")
+    else:
+        traceback.print_exc()
+
+def bench_inputs(now):
+    """Return representative customer phrasings, with fixed dates a few weeks after now."""
+    day = now + timedelta(days=30)
+    suffix = "th" if 10 <= day.day % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(day.day % 10, "th")
+    return (
+        "tomorrow at 4pm",
+        "today at 10:30am",
+        "friday at 3pm",
+        "next tuesday at 11am",
+        f"{day:%Y-%m-%d} at 2pm",
+        f"{day.month}/{day.day} at 3:30pm",
+        f"{day:%B} {day.day}{suffix} at 2pm".lower(),
+        "sat 10am",
+    )
+
+def bench(parse, inputs, n=1000):
+    """Return the average seconds per call of parse over n rounds of inputs."""
+    start = time.perf_counter()
+    for _ in range(n):
+        for text in inputs:
+            parse(text)
+    return (time.perf_counter() - start) / (n * len(inputs))
+
+# Matches "tomorrow at 4pm", "today 10 am", "4:30pm" and "16:00" in a single pass
+_DATETIME_RE = re.compile(
+    r"(?:(?P<word>today|tomorrow)\D*)?(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>am|pm)?",
+    re.IGNORECASE
+)
+
 # Test direct datetime parsing
 try:
     print("Testing direct datetime parsing...")
@@ -26,42 +68,29 @@ try:
         print(f"ImportError: {ie}")
     except Exception as e:
         print(f"Error using dateutil.parser: {e}")
-        traceback.print_exc()
+        print_error_details()
     
     # Manual parsing attempt
     print("\nTesting manual parsing:")
-    time_str = "4pm" 
-    time_match = None
+    time_str = "tomorrow at 4pm"
+    
+    # Extract the day word, hours, minutes and AM/PM from the string
+    time_match = _DATETIME_RE.search(time_str)
     
-    # Try to extract hours/minutes from the time string
-    if ":" in time_str:
-        parts = time_str.split(":")
-        hour = int(parts[0])
-        # Handle minutes and AM/PM
-        if "pm" in parts[1].lower() and hour < 12:
-            hour += 12
-        minute = int(parts[1].replace("am", "").replace("pm", "").strip())
-    else:
-        time_match = None
-        try:
-            import re
-            # Look for patterns like "4pm", "10am", etc.
-            time_match = re.search(r"(\d+)\s*(am|pm)?", time_str, re.IGNORECASE)
-        except Exception as re_error:
-            print(f"Regex error: {re_error}")
-            
     if time_match:
         print(f"Regex matched: {time_match.groups()}")
-        hour = int(time_match.group(1))
-        am_pm = time_match.group(2)
+        hour = int(time_match.group("hour"))
+        minute = int(time_match.group("minute") or 0)
+        am_pm = time_match.group("ampm")
         
         if am_pm and am_pm.lower() == "pm" and hour < 12:
             hour += 12
-        print(f"Parsed time: {hour}:00")
+        print(f"Parsed time: {hour}:{minute:02d}")
         
-        # Calculate final result
-        base_date = tomorrow.date()
-        result = datetime.combine(base_date, datetime.min.time().replace(hour=hour))
+        # Calculate final result (a bare time means tomorrow)
+        is_today = (time_match.group("word") or "").lower() == "today"
+        base_date = datetime.now().date() if is_today else tomorrow.date()
+        result = datetime.combine(base_date, datetime.min.time().replace(hour=hour, minute=minute))
         print(f"Final parsed result: {result}")
     else:
         print("Time regex did not match")
@@ -74,8 +103,22 @@ try:
         print(f"parse_datetime result: {result}")
     except Exception as e:
         print(f"Error in parse_datetime: {e}")
-        traceback.print_exc()
+        print_error_details()
         
 except Exception as e:
     print(f"Unexpected error: {e}")
-    traceback.print_exc()
+    print_error_details()
+
+# The benchmark only runs when the script is run directly, not when it's imported
+if __name__ == "__main__":
+    try:
+        from services.appointment_service import parse_datetime, get_current_datetime
+        inputs = bench_inputs(get_current_datetime())
+        
+        # Time many calls so the one-off import and regex compile costs are amortized
+        iterations = int(os.environ.get("BARBER_BENCH_ITERATIONS", "1000"))
+        per_call = bench(parse_datetime, inputs, iterations)
+        print(f"\nparse_datetime average over {iterations} x {len(inputs)} inputs: {per_call * 1e6:.1f} µs/call")
+    except Exception as e:
+        print(f"Error benchmarking parse_datetime: {e}")
+        print_error_details()
@@ -5,33 +5,31 @@ Simple test script to verify LangSmith integration.
 
 import os
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain_ollama import Ollama
 
 # Load environment variables
 load_dotenv()
 
+# Environment variables LangSmith tracing needs, checked once at startup
+REQUIRED_VARS = ('LANGSMITH_TRACING', 'LANGSMITH_API_KEY')
+MISSING_VARS = tuple(var for var in REQUIRED_VARS if not os.environ.get(var))
+
 def main():
     """Run a simple LangSmith test."""
     print("Testing LangSmith integration...")
     
     # Check if we have the necessary environment variables
-    required_vars = [
-        'LANGSMITH_TRACING', 
-        'LANGSMITH_API_KEY'
-    ]
-    
-    for var in required_vars:
-        if not os.environ.get(var):
-            print(f"Error: {var} environment variable is not set.")
-            print("Please set all required environment variables in your .env file.")
-            return
+    if MISSING_VARS:
+        print(f"Error: {', '.join(MISSING_VARS)} environment variable(s) not set.")
+        print("Please set all required environment variables in your .env file.")
+        return
     
     try:
         # Try to use Ollama (free and open source)
         try:
             print("\nAttempting to use Ollama (local open-source model)...")
-            llm = Ollama(model="llama2")
+            # Each provider is imported only when it's tried
+            from langchain_ollama import OllamaLLM
+            llm = OllamaLLM(model="llama2")
             using_model = "Ollama (llama2)"
         except Exception as e:
             print(f"\nCouldn't connect to Ollama: {e}")
@@ -45,17 +43,26 @@ def main():
                 print("2. Add your OpenAI API key to the .env file")
                 return
                 
+            from langchain_openai import ChatOpenAI
             llm = ChatOpenAI()
             using_model = "OpenAI"
         
-        # Invoke the LLM
-        print(f"\nSending a test message using {using_model}...")
-        response = llm.invoke("Hello! I'm testing my integration with LangSmith. Please respond with a short greeting.")
+        # Send a small batch so the run also shows how concurrent requests are traced
+        prompts = [
+            "Hello! I'm testing my integration with LangSmith. Please respond with a short greeting.",
+            "Say hi in three words.",
+        ]
+        print(f"\nSending {len(prompts)} test messages using {using_model}...")
+        
+        # One tracer for the whole batch instead of one set up from the environment per call
+        from langchain_core.tracers import LangChainTracer
+        tracer = LangChainTracer()
+        responses = llm.batch(prompts, config={"callbacks": [tracer]})
         
-        if using_model == "Ollama (llama2)":
-            print(f"\nLLM Response: {response}")
-        else:
-            print(f"\nLLM Response: {response.content}")
+        for prompt, response in zip(prompts, responses):
+            text = response if using_model == "Ollama (llama2)" else response.content
+            print(f"\nPrompt: {prompt}")
+            print(f"LLM Response: {text}")
             
         print("\nIf LangSmith is configured correctly, you should see this run in your LangSmith dashboard.")
         print("Visit: https://smith.langchain.com/projects")